@@ -1,15 +1,150 @@
 import random
-from attacks import is_valid_attack, attack
+from collections import deque
+from importlib.machinery import PathFinder
+
+from attacks import attack
+from openings import load_book
+from solver import load_policy
+
+# Checked without importing: NumPy (for Expert) and the Monte Carlo
+# engine are only loaded once a move of that difficulty is needed.
+HAVE_NUMPY = PathFinder.find_spec("numpy") is not None
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+if HAVE_NUMPY:
+    DIFFICULTIES.append("Expert")
+DIFFICULTIES.append("Monte Carlo")
+# Plays a solved optimal policy (see solver) where the board has one,
+# and like Hard elsewhere.
+DIFFICULTIES.append("Perfect")
+
+# Difficulties whose moves can take milliseconds or more; front ends run
+# them off their event loop. The rest answer in microseconds.
+SLOW_DIFFICULTIES = {"Expert", "Monte Carlo"}
+
+# Heatmap helpers that used to live here, still reachable as ai.<name>.
+_HEATMAP_NAMES = {
+    "HIT_WEIGHT", "HEATMAP_CACHE", "HEATMAP_CACHE_SIZE", "HEATMAP_CACHE_MAX_BOARD",
+    "TranspositionTable", "mask_to_array", "density_heatmap", "board_observation",
+    "best_cell", "canonical_key", "cached_heatmap",
+}
+
+
+def __getattr__(name):
+    if name in _HEATMAP_NAMES:
+        import heatmap
+        return getattr(heatmap, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def preload_engine(difficulty):
+    """Imports what a difficulty needs ahead of its first move."""
+    if difficulty == "Expert" and HAVE_NUMPY:
+        import heatmap
+    elif difficulty == "Monte Carlo":
+        import montecarlo
+
+
+def expert_shot(board, rng=None):
+    if not HAVE_NUMPY:
+        raise RuntimeError("Expert difficulty requires NumPy")
+    from heatmap import expert_shot as heatmap_shot
+    return heatmap_shot(board, rng)
+
+
+# ---------- CANDIDATE POOLS ----------
+
+class CellPool:
+    """
+    Unordered set of cells with O(1) add, discard, pop and random pick.
+    Removal swaps the last cell into the freed slot.
+    """
+
+    __slots__ = ("cells", "index")
+
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def peek(self):
+        return self.cells[-1]
+
+    def choice(self, rng):
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class TargetQueue:
+    """FIFO of cells to try next, with O(1) membership and removal."""
+
+    __slots__ = ("queue", "members")
+
+    def __init__(self, cells=()):
+        self.queue = deque()
+        self.members = set()
+        for cell in cells:
+            self.push(cell)
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, cell):
+        return cell in self.members
+
+    def __iter__(self):
+        return (cell for cell in self.queue if cell in self.members)
+
+    def push(self, cell):
+        if cell not in self.members:
+            self.members.add(cell)
+            self.queue.append(cell)
+
+    def discard(self, cell):
+        # Lazily dropped from the deque when it reaches the front.
+        self.members.discard(cell)
+
+    def popleft(self):
+        while self.queue:
+            cell = self.queue.popleft()
+            if cell in self.members:
+                self.members.remove(cell)
+                return cell
+        raise IndexError("pop from an empty TargetQueue")
+
 
 # ---------- HUNT GRID ----------
 
-def generate_hunt_cells(board_size):
+def generate_hunt_cells(board_size, rng=None):
+    if rng is None:
+        rng = random
     cells = []
     for r in range(board_size):
         for c in range(board_size):
             if (r + c) % 2 == 0:
                 cells.append((r, c))
-    random.shuffle(cells)
+    rng.shuffle(cells)
     return cells
 
 
@@ -27,62 +162,163 @@ def get_adjacent_cells(row, col, board_size):
     ]
 
 
+# ---------- AI STATE ----------
+
+def new_ai_state(board_size, rng=None, ship_sizes=None):
+    """
+    "open_cells" holds every unshot cell, "hunt_cells" the unshot parity
+    cells in a shuffled order, "targets" the cells queued by Hard's
+    target mode. Shot cells leave all three at once (see record_shot).
+    "book" is the opening book for this board and fleet (see openings)
+    and "book_node" the current node in it, -1 once out of the book.
+    "policy" and "policy_node" are the same for Perfect's solved policy.
+    """
+    book = load_book(board_size, ship_sizes) if ship_sizes else None
+    policy = load_policy(board_size, ship_sizes) if ship_sizes else None
+    return {
+        "mode": "hunt",
+        "open_cells": CellPool(
+            (r, c) for r in range(board_size) for c in range(board_size)
+        ),
+        "hunt_cells": CellPool(generate_hunt_cells(board_size, rng)),
+        "targets": TargetQueue(),
+        "book": book,
+        "book_node": 0 if book else -1,
+        "policy": policy,
+        "policy_node": 0 if policy else -1
+    }
+
+
+def _advance_book(ai_state, cell, hit, difficulty):
+    node = ai_state.get("book_node", -1)
+    if node < 0:
+        return
+    book = ai_state["book"]
+    # Leave the book once play departs from it: another cell was shot,
+    # a ship sank (books assume none has), or Hard found its first hit.
+    if book[node] != cell or (hit and (hit.sunk or difficulty == "Hard")):
+        node = -1
+    else:
+        node = 2 * node + (2 if hit else 1)
+        if node >= len(book):
+            node = -1
+    ai_state["book_node"] = node
+
+
+def _advance_policy(ai_state, cell, hit):
+    node = ai_state.get("policy_node", -1)
+    if node < 0:
+        return
+    policy = ai_state["policy"]
+    # Another cell was shot (e.g. a cheaper difficulty stood in): the
+    # policy no longer knows where the game is.
+    if policy.cells[node] != cell:
+        node = -1
+    else:
+        node = policy.next_node(node, hit)
+    ai_state["policy_node"] = node
+
+
+def record_shot(ai_state, cell, hit, board_size, difficulty):
+    ai_state["open_cells"].discard(cell)
+    ai_state["hunt_cells"].discard(cell)
+    ai_state["targets"].discard(cell)
+    _advance_book(ai_state, cell, hit, difficulty)
+    _advance_policy(ai_state, cell, hit)
+
+    if hit and difficulty in ("Hard", "Perfect"):
+        ai_state["mode"] = "target"
+        for adjacent in get_adjacent_cells(cell[0], cell[1], board_size):
+            if adjacent in ai_state["open_cells"]:
+                ai_state["targets"].push(adjacent)
+
+
 # ---------- AI TURN ----------
 
-def ai_turn(player_board, ai_state, difficulty):
-    board_size = len(player_board)
+def choose_move(player_board, ai_state, difficulty, rng=None):
+    """
+    Picks the next cell to fire at without touching the board.
+    Returns None only when every cell has already been shot.
+    """
+    if rng is None:
+        rng = random
+
+    if not ai_state["open_cells"]:
+        return None
 
     # ---------------- EASY ----------------
     if difficulty == "Easy":
-        available = [
-            (r, c)
-            for r in range(board_size)
-            for c in range(board_size)
-            if is_valid_attack(player_board, r, c)
-        ]
+        return ai_state["open_cells"].choice(rng)
 
-        if not available:
-            return ai_state, None, None
+    # ---------------- SOLVED POLICY (PERFECT) ----------------
+    if difficulty == "Perfect" and ai_state.get("policy_node", -1) >= 0:
+        return ai_state["policy"].cells[ai_state["policy_node"]]
 
-        r, c = random.choice(available)
-        hit = attack(player_board, r, c)
-        return ai_state, (r, c), hit
+    # ---------------- OPENING BOOK (HARD + EXPERT) ----------------
+    # Hard only follows it while hunting, until its first hit.
+    if difficulty in ("Hard", "Expert") and ai_state.get("book_node", -1) >= 0:
+        return ai_state["book"][ai_state["book_node"]]
 
-    # ---------------- TARGET MODE (HARD ONLY) ----------------
-    if difficulty == "Hard" and ai_state["mode"] == "target":
-        while ai_state["targets"]:
-            r, c = ai_state["targets"].pop(0)
+    # ---------------- EXPERT ----------------
+    if difficulty == "Expert":
+        return expert_shot(player_board, rng)
 
-            if not is_valid_attack(player_board, r, c):
-                continue
+    # ---------------- MONTE CARLO ----------------
+    # Optional ai_state keys: "time_budget" (seconds), "sample_budget"
+    # (layouts) and "mc_stats" (dict filled with the last move's stats).
+    if difficulty == "Monte Carlo":
+        from montecarlo import monte_carlo_shot, TIME_BUDGET
+        return monte_carlo_shot(
+            player_board,
+            rng,
+            time_budget=ai_state.get("time_budget", TIME_BUDGET),
+            max_samples=ai_state.get("sample_budget"),
+            stats=ai_state.get("mc_stats")
+        )
 
-            hit = attack(player_board, r, c)
+    # ---------------- TARGET MODE (HARD + PERFECT) ----------------
+    # Perfect gets here only without a policy for this board.
+    if difficulty in ("Hard", "Perfect") and ai_state["mode"] == "target":
+        if ai_state["targets"]:
+            return ai_state["targets"].popleft()
 
-            if hit:
-                for cell in get_adjacent_cells(r, c, board_size):
-                    if cell not in ai_state["targets"]:
-                        ai_state["targets"].append(cell)
-
-            return ai_state, (r, c), hit
-
-        # No valid targets left → back to hunt
+        # No targets left → back to hunt
         ai_state["mode"] = "hunt"
 
     # ---------------- HUNT MODE (MEDIUM + HARD) ----------------
-    while ai_state["hunt_cells"]:
-        r, c = ai_state["hunt_cells"].pop()
+    if ai_state["hunt_cells"]:
+        return ai_state["hunt_cells"].peek()
+
+    # Parity cells used up: any unshot cell will do.
+    return ai_state["open_cells"].choice(rng)
 
-        if not is_valid_attack(player_board, r, c):
-            continue
 
-        hit = attack(player_board, r, c)
+def move_kind(ai_state, difficulty):
+    """Which branch of choose_move will pick the next move (for profiling)."""
+    if difficulty == "Easy":
+        return "easy"
+    if difficulty == "Perfect" and ai_state.get("policy_node", -1) >= 0:
+        return "perfect"
+    if difficulty in ("Hard", "Expert") and ai_state.get("book_node", -1) >= 0:
+        return "book"
+    if difficulty == "Expert":
+        return "expert"
+    if difficulty == "Monte Carlo":
+        return "monte_carlo"
+    if (difficulty in ("Hard", "Perfect") and ai_state["mode"] == "target"
+            and ai_state["targets"]):
+        return "target"
+    return "hunt"
+
 
-        if hit and difficulty == "Hard":
-            ai_state["mode"] = "target"
-            ai_state["targets"] = get_adjacent_cells(r, c, board_size)
+def ai_turn(player_board, ai_state, difficulty, rng=None):
+    board_size = len(player_board)
 
-        return ai_state, (r, c), hit
+    move = choose_move(player_board, ai_state, difficulty, rng)
+    if move is None:
+        return ai_state, None, None
 
-    # ---------------- SAFETY RESET ----------------
-    ai_state["hunt_cells"] = generate_hunt_cells(board_size)
-    return ai_state, None, None
+    r, c = move
+    hit = attack(player_board, r, c)
+    record_shot(ai_state, move, hit, board_size, difficulty)
+    return ai_state, move, hit
@@ -1,18 +1,20 @@
+from board import (
+    AttackResult,
+    MISS,
+    HIT,
+    SUNK,
+    ALREADY_SHOT,
+)
+
+
 def is_valid_attack(board, row, col):
-    return board[row][col] in ("~", "S")
+    return board.is_valid_attack(row, col)
 
 
 def attack(board, row, col):
     """
     Applies an attack to the board.
-    Returns True if hit, False if miss.
+    Returns an AttackResult: miss, hit, sunk (with ship_id) or already-shot.
+    The result is truthy for hits, falsy for misses and repeated shots.
     """
-    if board[row][col] == "S":
-        board[row][col] = "X"
-        return True
-    if board[row][col] == "~":
-        board[row][col] = "O"
-        return False
-
-    # Defensive fallback (should never happen)
-    return None
+    return board.attack(row, col)
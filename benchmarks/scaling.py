@@ -0,0 +1,161 @@
+"""
+Board-size scaling benchmark.
+
+For each board size reports game setup time, per-move AI latency for
+every difficulty and, when a display is available, board build and
+per-move render time for the renderer the GUI would pick.
+
+    python -m benchmarks.scaling --sizes 5 10 20 50 100 200
+"""
+
+import argparse
+import json
+import random
+import time
+
+from ai import DIFFICULTIES
+from game import GameSession, fleet_for_size, shot_cells
+
+MC_SAMPLES = 200
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))]
+
+
+def new_session(board_size, difficulty, seed):
+    session = GameSession(
+        board_size, fleet_for_size(board_size), difficulty, rng=random.Random(seed)
+    )
+    session.auto_place_player()
+    session.finish_placement()
+    if difficulty == "Monte Carlo":
+        session.ai_state["sample_budget"] = MC_SAMPLES
+        session.ai_state["time_budget"] = None
+    return session
+
+
+def bench_setup(board_size, repeats, seed):
+    times = []
+    for i in range(repeats):
+        began = time.perf_counter()
+        new_session(board_size, "Hard", seed + i)
+        times.append(time.perf_counter() - began)
+    return _ms(min(times))
+
+
+def bench_ai(board_size, difficulty, moves, seed):
+    session = new_session(board_size, difficulty, seed)
+    times = []
+    while len(times) < moves and not session.is_over:
+        session.skip_player_turn()
+        began = time.perf_counter()
+        session.ai_move()
+        times.append(time.perf_counter() - began)
+    return {"mean_ms": _ms(sum(times) / len(times)), "p99_ms": _ms(_percentile(times, 99))}
+
+
+def bench_render(board_size, moves, seed):
+    """Returns None when Tk cannot open a display."""
+    import tkinter as tk
+    from gui.gui_boards import create_player_board, update_player_board, use_canvas
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+    try:
+        session = new_session(board_size, "Easy", seed)
+        board = session.player_board
+
+        began = time.perf_counter()
+        buttons = create_player_board(root, board_size)
+        root.update_idletasks()
+        build = time.perf_counter() - began
+
+        began = time.perf_counter()
+        update_player_board(board, buttons, board.fleet.sunk_cells, True)
+        root.update_idletasks()
+        full = time.perf_counter() - began
+
+        times = []
+        while len(times) < moves and not session.is_over:
+            session.skip_player_turn()
+            move, result = session.ai_move()
+            began = time.perf_counter()
+            update_player_board(
+                board, buttons, board.fleet.sunk_cells, True,
+                changed=shot_cells(board, move, result)
+            )
+            root.update_idletasks()
+            times.append(time.perf_counter() - began)
+
+        return {
+            "renderer": "canvas" if use_canvas(board_size) else "buttons",
+            "build_ms": _ms(build),
+            "full_refresh_ms": _ms(full),
+            "move_mean_ms": _ms(sum(times) / len(times)),
+        }
+    finally:
+        root.destroy()
+
+
+def run(sizes, difficulties, moves, repeats, seed):
+    """Yields one result row per board size as soon as it is measured."""
+    for board_size in sizes:
+        fleet = fleet_for_size(board_size)
+        yield {
+            "size": board_size,
+            "ships": len(fleet),
+            "ship_cells": sum(fleet),
+            "setup_ms": bench_setup(board_size, repeats, seed),
+            "ai": {d: bench_ai(board_size, d, moves, seed) for d in difficulties},
+            "render": bench_render(board_size, moves, seed),
+        }
+
+
+def print_row(row):
+    print(f"{row['size']}x{row['size']}: {row['ships']} ships "
+          f"({row['ship_cells']} cells), setup {row['setup_ms']} ms")
+    for difficulty, stats in row["ai"].items():
+        label = difficulty
+        if difficulty == "Monte Carlo":
+            label += f" ({MC_SAMPLES} samples)"
+        print(f"    AI {label:<28} mean {stats['mean_ms']:>9} ms   p99 {stats['p99_ms']:>9} ms")
+    render = row["render"]
+    if render is None:
+        print("    render: no display available")
+    else:
+        print(f"    render ({render['renderer']}): build {render['build_ms']} ms, "
+              f"full refresh {render['full_refresh_ms']} ms, "
+              f"per move {render['move_mean_ms']} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Board-size scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 50, 100, 200])
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES))
+    parser.add_argument("--moves", type=int, default=50, help="moves timed per size")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = []
+    for row in run(args.sizes, args.difficulties, args.moves, args.repeats, args.seed):
+        print_row(row)
+        results.append(row)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
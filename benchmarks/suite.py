@@ -0,0 +1,270 @@
+"""
+Micro and macro benchmarks for the core game modules (standard library only).
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --output current.json
+    python -m benchmarks.suite --current current.json --compare baseline.json
+
+Micro benchmarks time single functions in attacks, board, ships and ai;
+macro benchmarks time complete games from setup to win. Results are
+written as JSON together with machine metadata. --compare flags every
+benchmark that got slower than the baseline by more than --threshold and
+exits with status 1 if any did.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from ai import (
+    DIFFICULTIES,
+    ai_turn,
+    generate_hunt_cells,
+    get_adjacent_cells,
+    new_ai_state
+)
+from attacks import attack, is_valid_attack
+from board import create_board, all_ships_sunk
+from game import fleet_for_size
+from ships import can_place_ship, place_all_ships
+from simulate import play_game
+
+BOARD_SIZE = 10
+MIN_TIME = 0.2
+REPEATS = 5
+THRESHOLD = 0.10
+MC_SAMPLES = 100
+
+
+# ---------- TIMING ----------
+
+def measure(func, ops_per_call=1, repeats=REPEATS, min_time=MIN_TIME):
+    """
+    Calls func in batches big enough to last min_time and returns the
+    best and median time per operation in nanoseconds.
+    """
+    number = 1
+    while True:
+        began = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - began
+        if elapsed >= min_time / 5:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - began) / number / ops_per_call * 1e9)
+    samples.sort()
+    return {
+        "best_ns": round(samples[0], 1),
+        "median_ns": round(samples[len(samples) // 2], 1),
+        "calls": number,
+        "ops_per_call": ops_per_call,
+    }
+
+
+# ---------- MICRO ----------
+
+def micro_benchmarks(board_size, seed):
+    rng = random.Random(seed)
+    fleet = fleet_for_size(board_size)
+    cells = [(r, c) for r in range(board_size) for c in range(board_size)]
+
+    template = create_board(board_size)
+    place_all_ships(template, fleet, rng=rng)
+    half_shot = template.copy()
+    for r, c in rng.sample(cells, len(cells) // 2):
+        attack(half_shot, r, c)
+
+    def bench_attack():
+        board = template.copy()
+        for r, c in cells:
+            attack(board, r, c)
+
+    def bench_is_valid_attack():
+        for r, c in cells:
+            is_valid_attack(half_shot, r, c)
+
+    def bench_all_ships_sunk():
+        all_ships_sunk(half_shot)
+
+    def bench_can_place_ship():
+        for r, c in cells:
+            can_place_ship(template, r, c, 3, "H")
+            can_place_ship(template, r, c, 3, "V")
+
+    def bench_place_all_ships():
+        place_all_ships(create_board(board_size), fleet, rng=rng)
+
+    def bench_generate_hunt_cells():
+        generate_hunt_cells(board_size, rng)
+
+    def bench_get_adjacent_cells():
+        for r, c in cells:
+            get_adjacent_cells(r, c, board_size)
+
+    benches = {
+        "attacks.attack": (bench_attack, len(cells)),
+        "attacks.is_valid_attack": (bench_is_valid_attack, len(cells)),
+        "board.all_ships_sunk": (bench_all_ships_sunk, 1),
+        "ships.can_place_ship": (bench_can_place_ship, 2 * len(cells)),
+        "ships.place_all_ships": (bench_place_all_ships, 1),
+        "ai.generate_hunt_cells": (bench_generate_hunt_cells, 1),
+        "ai.get_adjacent_cells": (bench_get_adjacent_cells, len(cells)),
+    }
+
+    for difficulty in DIFFICULTIES:
+        benches[f"ai.ai_turn[{difficulty}]"] = ai_turn_bench(
+            template, difficulty, seed
+        )
+
+    return benches
+
+
+def ai_turn_bench(template, difficulty, seed):
+    """Clears a fixed fleet with ai_turn; timed per move."""
+    board_size = len(template)
+    ship_sizes = [len(cells) for cells in template.fleet.ships]
+    rng = random.Random(seed)
+
+    def play():
+        board = template.copy()
+        state = new_ai_state(board_size, rng, ship_sizes)
+        if difficulty == "Monte Carlo":
+            state["sample_budget"] = MC_SAMPLES
+            state["time_budget"] = None
+        moves = 0
+        while not all_ships_sunk(board):
+            ai_turn(board, state, difficulty, rng)
+            moves += 1
+        return moves
+
+    # Moves per game vary with the rng; use the average over a few games.
+    moves = sum(play() for _ in range(5)) / 5
+    return play, moves
+
+
+# ---------- MACRO ----------
+
+def macro_benchmarks(board_size, seed):
+    benches = {}
+    for difficulty in DIFFICULTIES:
+        if difficulty == "Monte Carlo":
+            continue  # time-budgeted by design, not a throughput number
+
+        counter = [0]
+
+        def game(difficulty=difficulty, counter=counter):
+            counter[0] += 1
+            rng = random.Random(f"{seed}:{counter[0]}")
+            play_game(board_size, difficulty, rng)
+
+        benches[f"game[{difficulty}, {board_size}x{board_size}]"] = (game, 1)
+    return benches
+
+
+# ---------- METADATA ----------
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_metadata():
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": git_commit(),
+    }
+
+
+# ---------- RUN / COMPARE ----------
+
+def run(board_size, seed, select=None):
+    benches = {}
+    benches.update(micro_benchmarks(board_size, seed))
+    benches.update(macro_benchmarks(board_size, seed))
+
+    results = {}
+    for name, (func, ops) in benches.items():
+        if select and not any(s in name for s in select):
+            continue
+        results[name] = measure(func, ops)
+        print(f"{name:<40} {results[name]['best_ns']:>14,.1f} ns/op")
+    return {"metadata": machine_metadata(), "results": results}
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """Returns the names of benchmarks slower than baseline by more than threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<40} {'-':>14} {result['best_ns']:>14,.1f}      new")
+            continue
+        change = result["best_ns"] / old["best_ns"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<40} {old['best_ns']:>14,.1f} {result['best_ns']:>14,.1f} "
+              f"{change:>+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Battleship benchmark suite")
+    parser.add_argument("--size", type=int, default=BOARD_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--select", nargs="+", help="only run benchmarks whose name contains one of these")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--current", help="compare this results file instead of running")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run(args.size, args.seed, args.select)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
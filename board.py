@@ -1,9 +1,323 @@
+from functools import lru_cache
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def popcount(mask):
+        return bin(mask).count("1")
+
+
+# ---------- MASK HELPERS ----------
+
+@lru_cache(maxsize=None)
+def _column_run(size, length):
+    mask = 0
+    for i in range(length):
+        mask |= 1 << (i * size)
+    return mask
+
+
+def ship_mask(size, row, col, ship_size, orientation):
+    """
+    Bitmask of the cells covered by a ship.
+    Bounds are not checked here, see ships.can_place_ship.
+    """
+    if orientation == "H":
+        return ((1 << ship_size) - 1) << (row * size + col)
+    return _column_run(size, ship_size) << (row * size + col)
+
+
+def mask_cells(size, mask):
+    cells = []
+    while mask:
+        low = mask & -mask
+        index = low.bit_length() - 1
+        cells.append(divmod(index, size))
+        mask ^= low
+    return cells
+
+
+# ---------- ATTACK RESULTS ----------
+
+MISS = 0
+HIT = 1
+SUNK = 2
+ALREADY_SHOT = 3
+
+
+class AttackResult:
+    """
+    Outcome of a single shot. Truthy for hits (including sinking hits),
+    so code that only cares about hit / miss keeps working.
+    """
+
+    __slots__ = ("kind", "ship_id")
+
+    def __init__(self, kind, ship_id=None):
+        self.kind = kind
+        self.ship_id = ship_id
+
+    def __bool__(self):
+        return self.kind == HIT or self.kind == SUNK
+
+    @property
+    def hit(self):
+        return self.kind == HIT or self.kind == SUNK
+
+    @property
+    def sunk(self):
+        return self.kind == SUNK
+
+    def __eq__(self, other):
+        if isinstance(other, AttackResult):
+            return self.kind == other.kind and self.ship_id == other.ship_id
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.kind, self.ship_id))
+
+    def __repr__(self):
+        name = ("miss", "hit", "sunk", "already-shot")[self.kind]
+        if self.kind == SUNK:
+            return f"AttackResult({name}, ship {self.ship_id})"
+        return f"AttackResult({name})"
+
+
+MISS_RESULT = AttackResult(MISS)
+HIT_RESULT = AttackResult(HIT)
+ALREADY_SHOT_RESULT = AttackResult(ALREADY_SHOT)
+
+
+# ---------- FLEET ----------
+
+class Fleet:
+    """
+    Cell -> ship id index with remaining hit points per ship,
+    so a shot knows in O(1) whether it sank something.
+    """
+
+    __slots__ = (
+        "size", "cell_ship", "ships", "hp",
+        "sunk", "sunk_cells", "sunk_mask", "results"
+    )
+
+    def __init__(self, size):
+        self.size = size
+        self.cell_ship = [-1] * (size * size)
+        self.ships = []
+        self.hp = []
+        self.sunk = set()
+        self.sunk_cells = set()
+        self.sunk_mask = 0
+        self.results = []
+
+    def __len__(self):
+        return len(self.ships)
+
+    def add(self, cells):
+        ship_id = len(self.ships)
+        for r, c in cells:
+            self.cell_ship[r * self.size + c] = ship_id
+        self.ships.append(cells)
+        self.hp.append(len(cells))
+        self.results.append(AttackResult(SUNK, ship_id))
+        return ship_id
+
+    def hit(self, index):
+        ship_id = self.cell_ship[index]
+        if ship_id < 0:
+            return HIT_RESULT
+        self.hp[ship_id] -= 1
+        if self.hp[ship_id]:
+            return HIT_RESULT
+        self.sunk.add(ship_id)
+        for r, c in self.ships[ship_id]:
+            self.sunk_mask |= 1 << (r * self.size + c)
+        self.sunk_cells.update(self.ships[ship_id])
+        return self.results[ship_id]
+
+    def remaining_sizes(self):
+        return [len(cells) for i, cells in enumerate(self.ships) if i not in self.sunk]
+
+    def copy(self):
+        other = Fleet(self.size)
+        other.cell_ship = self.cell_ship[:]
+        other.ships = self.ships[:]
+        other.hp = self.hp[:]
+        other.sunk = set(self.sunk)
+        other.sunk_cells = set(self.sunk_cells)
+        other.sunk_mask = self.sunk_mask
+        other.results = self.results[:]
+        return other
+
+
+# ---------- BOARD ----------
+
+class BoardRow:
+    """
+    Row view over a Board so that board[r][c] reads and writes
+    the familiar "~" / "S" / "X" / "O" characters.
+    """
+
+    __slots__ = ("board", "row")
+
+    def __init__(self, board, row):
+        self.board = board
+        self.row = row
+
+    def __len__(self):
+        return self.board.size
+
+    def _col(self, col):
+        size = self.board.size
+        if col < 0:
+            col += size
+        if not 0 <= col < size:
+            raise IndexError("board column out of range")
+        return col
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return [self.board.cell(self.row, c) for c in range(self.board.size)[col]]
+        return self.board.cell(self.row, self._col(col))
+
+    def __setitem__(self, col, value):
+        self.board.set_cell(self.row, self._col(col), value)
+
+    def __iter__(self):
+        cell = self.board.cell
+        for c in range(self.board.size):
+            yield cell(self.row, c)
+
+    def __contains__(self, value):
+        return value in list(self)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def count(self, value):
+        return list(self).count(value)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class Board:
+    """
+    Square board stored as three integer bitmasks (ships, hits, misses).
+    Bit r * size + c is the cell at (r, c). Ships added through add_ship
+    are also tracked by the board's Fleet.
+    """
+
+    __slots__ = ("size", "ships", "hits", "misses", "fleet")
+
+    def __init__(self, size):
+        self.size = size
+        self.ships = 0
+        self.hits = 0
+        self.misses = 0
+        self.fleet = Fleet(size)
+
+    # ---- compatibility view ----
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.size
+        if not 0 <= row < self.size:
+            raise IndexError("board row out of range")
+        return BoardRow(self, row)
+
+    def __iter__(self):
+        for r in range(self.size):
+            yield BoardRow(self, r)
+
+    def __repr__(self):
+        return f"Board({self.size}, {[list(row) for row in self]})"
+
+    def cell(self, row, col):
+        bit = 1 << (row * self.size + col)
+        if self.hits & bit:
+            return "X"
+        if self.misses & bit:
+            return "O"
+        if self.ships & bit:
+            return "S"
+        return "~"
+
+    def set_cell(self, row, col, value):
+        bit = 1 << (row * self.size + col)
+        self.ships &= ~bit
+        self.hits &= ~bit
+        self.misses &= ~bit
+        if value == "S":
+            self.ships |= bit
+        elif value == "X":
+            self.ships |= bit
+            self.hits |= bit
+        elif value == "O":
+            self.misses |= bit
+        elif value != "~":
+            raise ValueError(f"unknown cell value {value!r}")
+
+    # ---- fast paths ----
+
+    @property
+    def full(self):
+        return (1 << (self.size * self.size)) - 1
+
+    @property
+    def used(self):
+        return self.ships | self.hits | self.misses
+
+    @property
+    def shots(self):
+        return self.hits | self.misses
+
+    def add_ship(self, mask):
+        self.ships |= mask
+        return self.fleet.add(mask_cells(self.size, mask))
+
+    def is_valid_attack(self, row, col):
+        return not (self.hits | self.misses) >> (row * self.size + col) & 1
+
+    def attack(self, row, col):
+        index = row * self.size + col
+        bit = 1 << index
+        if (self.hits | self.misses) & bit:
+            return ALREADY_SHOT_RESULT
+        if self.ships & bit:
+            self.hits |= bit
+            return self.fleet.hit(index)
+        self.misses |= bit
+        return MISS_RESULT
+
+    def all_ships_sunk(self):
+        return not self.ships & ~self.hits
+
+    def hit_count(self):
+        return popcount(self.hits)
+
+    def miss_count(self):
+        return popcount(self.misses)
+
+    def remaining_count(self):
+        return popcount(self.ships & ~self.hits)
+
+    def copy(self):
+        other = Board(self.size)
+        other.ships = self.ships
+        other.hits = self.hits
+        other.misses = self.misses
+        other.fleet = self.fleet.copy()
+        return other
+
+
 def create_board(size):
-    return [["~"] * size for _ in range(size)]
+    return Board(size)
 
 
 def all_ships_sunk(board):
-    for row in board:
-        if "S" in row:
-            return False
-    return True
+    return board.all_ships_sunk()
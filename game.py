@@ -0,0 +1,235 @@
+import random
+
+import profiling
+from board import create_board, all_ships_sunk
+from ships import place_all_ships, can_place_ship, place_ship_at, fleet_for_board
+from attacks import attack, is_valid_attack
+from ai import new_ai_state, choose_move, record_shot, move_kind
+from movelog import MoveLog, PLAYER_SHOT, COMPUTER_SHOT
+
+SHIP_CONFIGS = {
+    5: [3, 2],
+    7: [4, 3, 2],
+    10: [5, 4, 3, 3, 2]
+}
+
+MIN_BOARD_SIZE = 5
+MAX_BOARD_SIZE = 200
+
+PLAYER = "player"
+COMPUTER = "computer"
+
+
+def fleet_for_size(board_size):
+    """Classic fleet for the preset sizes, a density-based one otherwise."""
+    if board_size in SHIP_CONFIGS:
+        return list(SHIP_CONFIGS[board_size])
+    return fleet_for_board(board_size)
+
+
+def shot_cells(board, move, result):
+    """Cells whose look changes after a shot: the cell, or the whole ship if it sank."""
+    if result is not None and result.sunk:
+        return board.fleet.ships[result.ship_id]
+    return [move]
+
+
+class GameSession:
+    """
+    Headless game state and turn flow: both boards, the computer's
+    fleet, the AI state, placement progress, turn order and the winner.
+    The GUI drives a session; simulations can drive one without Tk.
+    Every shot is appended to self.log (see movelog); pass log_stream
+    to have the log written through to an open binary file.
+    """
+
+    def __init__(self, board_size, ship_sizes=None, difficulty="Hard", rng=None,
+                 log_stream=None):
+        if ship_sizes is None:
+            ship_sizes = fleet_for_size(board_size)
+        if rng is None:
+            rng = random
+
+        self.board_size = board_size
+        self.ship_sizes = list(ship_sizes)
+        self.difficulty = difficulty
+        self.rng = rng
+
+        self.player_board = create_board(board_size)
+        self.computer_board = create_board(board_size)
+
+        place_all_ships(self.computer_board, self.ship_sizes, rng=rng)
+
+        self.current_ship_index = 0
+        self.placement_phase = True
+        self.turn = PLAYER
+        self.winner = None
+
+        self.ai_state = new_ai_state(board_size, rng, self.ship_sizes)
+        self.log = MoveLog(board_size, log_stream)
+
+    # ================= PLACEMENT =================
+
+    @property
+    def next_ship_size(self):
+        if self.current_ship_index < len(self.ship_sizes):
+            return self.ship_sizes[self.current_ship_index]
+        return None
+
+    @property
+    def all_ships_placed(self):
+        return self.current_ship_index == len(self.ship_sizes)
+
+    def can_place(self, row, col, orientation):
+        ship_size = self.next_ship_size
+        if ship_size is None:
+            return False
+        return can_place_ship(self.player_board, row, col, ship_size, orientation)
+
+    def place_player_ship(self, row, col, orientation):
+        """
+        Places the next ship of the player's fleet.
+        Returns the ship's cells, or None if the placement is invalid.
+        """
+        if not self.placement_phase or not self.can_place(row, col, orientation):
+            return None
+
+        cells = place_ship_at(
+            self.player_board, row, col, self.next_ship_size, orientation
+        )
+        self.current_ship_index += 1
+        return cells
+
+    def auto_place_player(self):
+        place_all_ships(
+            self.player_board,
+            self.ship_sizes[self.current_ship_index:],
+            rng=self.rng
+        )
+        self.current_ship_index = len(self.ship_sizes)
+
+    def place_computer_fleet(self, layout):
+        """
+        Replaces the computer's random fleet with `layout`, a list of ship
+        masks in fleet order (e.g. from placement.devious_layout).
+        Only allowed before the battle starts.
+        """
+        if not self.placement_phase:
+            raise ValueError("the battle has already started")
+        if len(layout) != len(self.ship_sizes):
+            raise ValueError("layout does not match the fleet")
+        board = create_board(self.board_size)
+        for mask in layout:
+            board.add_ship(mask)
+        self.computer_board = board
+
+    def finish_placement(self):
+        if not self.all_ships_placed:
+            raise ValueError("not all ships have been placed")
+        self.placement_phase = False
+        self.log.start(self.player_board, self.computer_board)
+
+    # ================= TURNS =================
+
+    @property
+    def is_over(self):
+        return self.winner is not None
+
+    def can_fire(self, row, col):
+        return (
+            not self.placement_phase
+            and not self.is_over
+            and self.turn == PLAYER
+            and is_valid_attack(self.computer_board, row, col)
+        )
+
+    def player_move(self, row, col):
+        """
+        Fires the player's shot at the computer board.
+        Returns the AttackResult, or None if the shot is not allowed.
+        """
+        if not self.can_fire(row, col):
+            return None
+
+        timing = profiling.ENABLED
+        if timing:
+            began = profiling.now()
+        result = attack(self.computer_board, row, col)
+        if timing:
+            began = profiling.record("attack", began)
+        self.log.record(PLAYER_SHOT, row, col, result)
+
+        over = all_ships_sunk(self.computer_board)
+        if timing:
+            profiling.record("sunk_scan", began)
+        if over:
+            self.winner = PLAYER
+        else:
+            self.turn = COMPUTER
+        return result
+
+    def skip_player_turn(self):
+        """Hands the turn to the computer without firing (used by simulations)."""
+        if not self.placement_phase and not self.is_over:
+            self.turn = COMPUTER
+
+    def ai_move(self):
+        """
+        Plays the computer's turn.
+        Returns (move, result); move is None if the AI skipped its turn.
+        """
+        if self.placement_phase or self.is_over or self.turn != COMPUTER:
+            return None, None
+
+        move = self.choose_ai_move()
+        return move, self.play_ai_move(move)
+
+    def choose_ai_move(self, board=None, difficulty=None):
+        """
+        Picks the computer's next cell without firing it.
+        To run this off the main thread pass a copy of player_board;
+        difficulty overrides the session's (e.g. for a cheap fallback).
+        """
+        if self.placement_phase or self.is_over or self.turn != COMPUTER:
+            return None
+        if board is None:
+            board = self.player_board
+        difficulty = difficulty or self.difficulty
+
+        if not profiling.ENABLED:
+            return choose_move(board, self.ai_state, difficulty, self.rng)
+        kind = move_kind(self.ai_state, difficulty)
+        began = profiling.now()
+        move = choose_move(board, self.ai_state, difficulty, self.rng)
+        profiling.record(f"ai_turn.{kind}", began)
+        return move
+
+    def play_ai_move(self, move):
+        """
+        Fires a move picked by choose_ai_move and ends the computer's turn.
+        Returns the AttackResult, or None if move is None.
+        """
+        if self.placement_phase or self.is_over or self.turn != COMPUTER:
+            return None
+
+        timing = profiling.ENABLED
+        result = None
+        if move is not None:
+            if timing:
+                began = profiling.now()
+            result = attack(self.player_board, move[0], move[1])
+            if timing:
+                profiling.record("attack", began)
+            record_shot(self.ai_state, move, result, self.board_size, self.difficulty)
+            self.log.record(COMPUTER_SHOT, move[0], move[1], result)
+
+        if timing:
+            began = profiling.now()
+        over = all_ships_sunk(self.player_board)
+        if timing:
+            profiling.record("sunk_scan", began)
+        if over:
+            self.winner = COMPUTER
+        else:
+            self.turn = PLAYER
+        return result
@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+import tkinter as tk
+
+POLL_MS = 15
+DEADLINE_MS = 2000
+
+
+class AIWorker:
+    """
+    Runs one computation at a time on a background thread and hands the
+    result back on the Tk main thread. The thread posts to a queue that
+    is polled with root.after, so Tk is only ever touched from mainloop.
+
+    Every submit() and cancel() bumps a generation number; results from
+    an older generation are dropped, which is how restarts abandon a
+    move that is still being computed. If no result arrives within the
+    deadline, the fallback is called instead and its value delivered.
+    """
+
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.results = queue.Queue()
+        self.generation = 0
+        self.job = None
+        self.pending = None
+
+    @property
+    def busy(self):
+        return self.pending is not None
+
+    def submit(self, func, on_done, fallback=None, deadline_ms=DEADLINE_MS):
+        self.cancel()
+        generation = self.generation
+        deadline = time.perf_counter() + deadline_ms / 1000
+        self.pending = (generation, on_done, fallback, deadline)
+
+        def run():
+            try:
+                self.results.put((generation, func(), None))
+            except Exception as e:  # reported on the main thread
+                self.results.put((generation, None, e))
+
+        threading.Thread(target=run, daemon=True).start()
+        self.job = self.root.after(self.poll_ms, self._poll)
+
+    def cancel(self):
+        self.generation += 1
+        self.pending = None
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except tk.TclError:
+                pass  # root already destroyed
+            self.job = None
+
+    def _poll(self):
+        self.job = None
+        if self.pending is None:
+            return
+        generation, on_done, fallback, deadline = self.pending
+
+        while True:
+            try:
+                result_generation, value, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if result_generation == generation:
+                if error is None:
+                    self._finish(on_done, value)
+                else:
+                    print(f"AI worker failed: {error!r}; using fallback move")
+                    self._finish(on_done, fallback() if fallback else None)
+                return
+
+        if time.perf_counter() >= deadline:
+            self._finish(on_done, fallback() if fallback else None)
+            return
+
+        self.job = self.root.after(self.poll_ms, self._poll)
+
+    def _finish(self, on_done, value):
+        # A late result from this generation must not be applied twice.
+        self.generation += 1
+        self.pending = None
+        on_done(value)
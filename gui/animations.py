@@ -1,33 +1,118 @@
-def hit_animation(widget, on_finish=None):
-    colors = ["#ffcccc", "#ff6666", "#cc0000"]
+import time
+import tkinter as tk
 
-    def step(i=0):
-        if i < len(colors):
-            widget.config(bg=colors[i])
-            widget.after(70, step, i + 1)
-        else:
+HIT_COLORS = ["#ffcccc", "#ff6666", "#cc0000"]
+MISS_COLORS = ["#cceeff", "#66ccff", "#3399ff"]
+INVALID_COLORS = ["#ffaaaa", "blue"]
+
+STEP_MS = 70
+FRAME_MS = 16
+
+# Speed presets offered in the GUI; 0 means instant.
+SPEEDS = {"Normal": 1.0, "Fast": 3.0, "Instant": 0}
+
+
+class Animator:
+    """
+    Single frame clock for every cell animation.
+
+    Each animation is a list of colors shown STEP_MS apart. One Tk timer
+    ticks every FRAME_MS while anything is playing and applies all due
+    color changes in one pass, so overlapping effects cost one callback
+    per frame. speed scales time; speed 0 (instant) jumps straight to the
+    final color. cancel_all() drops everything still pending.
+    """
+
+    def __init__(self, root, speed=1.0, frame_ms=FRAME_MS):
+        self.root = root
+        self.speed = speed
+        self.frame_ms = frame_ms
+        self.active = []
+        self.job = None
+
+    @property
+    def instant(self):
+        return self.speed <= 0
+
+    def play(self, widget, colors, step_ms=STEP_MS, on_finish=None):
+        if self.instant:
+            _set_bg(widget, colors[-1])
             if on_finish:
                 on_finish()
+            return
 
-    step()
+        _set_bg(widget, colors[0])
+        self.active.append([widget, colors, step_ms, time.perf_counter(), 0, on_finish])
+        if self.job is None:
+            self.job = self.root.after(self.frame_ms, self._tick)
+
+    def _tick(self):
+        self.job = None
+        now = time.perf_counter()
+        updates = {}
+        finished = []
+        still_active = []
+
+        for anim in self.active:
+            widget, colors, step_ms, started, shown, on_finish = anim
+            step = int((now - started) * 1000 * self.speed // step_ms)
+            if step >= len(colors):
+                finished.append(on_finish)
+                continue
+            if step != shown:
+                anim[4] = step
+                updates[id(widget)] = (widget, colors[step])
+            still_active.append(anim)
+
+        self.active = still_active
+        for widget, color in updates.values():
+            _set_bg(widget, color)
 
-def miss_animation(widget, on_finish=None):
-    colors = ["#cceeff", "#66ccff", "#3399ff"]
+        if self.active:
+            self.job = self.root.after(self.frame_ms, self._tick)
+
+        for on_finish in finished:
+            if on_finish:
+                on_finish()
+
+    def cancel_all(self):
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except tk.TclError:
+                pass
+            self.job = None
+        self.active.clear()
+
+
+def _set_bg(widget, color):
+    try:
+        widget.config(bg=color)
+    except tk.TclError:
+        pass  # widget destroyed mid-animation
+
+
+def _play(widget, colors, step_ms, on_finish, animator):
+    if animator is not None:
+        animator.play(widget, colors, step_ms, on_finish)
+        return
 
     def step(i=0):
         if i < len(colors):
             widget.config(bg=colors[i])
-            widget.after(70, step, i + 1)
+            widget.after(step_ms, step, i + 1)
         else:
             if on_finish:
                 on_finish()
 
     step()
 
-def invalid_click_animation(widget):
-    colors = ["#ffaaaa", "blue"]
-    def step(i=0):
-        if i < len(colors):
-            widget.config(bg=colors[i])
-            widget.after(80, step, i + 1)
-    step()
+
+def hit_animation(widget, on_finish=None, animator=None):
+    _play(widget, HIT_COLORS, STEP_MS, on_finish, animator)
+
+def miss_animation(widget, on_finish=None, animator=None):
+    _play(widget, MISS_COLORS, STEP_MS, on_finish, animator)
+
+def invalid_click_animation(widget, animator=None):
+    _play(widget, INVALID_COLORS, 80, None, animator)
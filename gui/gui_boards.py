@@ -1,5 +1,81 @@
+import os
 import tkinter as tk
 
+from gui.gui_canvas import CanvasBoard
+
+SUNK_COLOR = "#8B0000"
+
+# Boards larger than this are drawn on a single Canvas instead of one
+# Button per cell. BATTLESHIP_RENDERER=buttons|canvas forces either one.
+CANVAS_THRESHOLD = 12
+
+
+class ButtonGrid(list):
+    """
+    Rows of cell buttons (still indexable as buttons[r][c]) that remember
+    the last color drawn in each cell, so repainting an unchanged cell
+    costs no Tk call. config_calls counts the bg updates actually sent.
+    """
+
+    def __init__(self, rows, color=None):
+        super().__init__(rows)
+        self.colors = [[color] * len(row) for row in rows]
+        self.config_calls = 0
+
+    def paint(self, r, c, color):
+        if self.colors[r][c] != color:
+            self[r][c].config(bg=color)
+            self.colors[r][c] = color
+            self.config_calls += 1
+
+    def pop_config_calls(self):
+        calls = self.config_calls
+        self.config_calls = 0
+        return calls
+
+    def cell(self, r, c):
+        return self[r][c]
+
+    def bind_cells(self, click=None, enter=None, leave=None):
+        for r, row in enumerate(self):
+            for c, btn in enumerate(row):
+                if click:
+                    btn.config(command=lambda r=r, c=c: click(r, c))
+                if enter:
+                    btn.bind("<Enter>", lambda e, r=r, c=c: enter(r, c))
+                if leave:
+                    btn.bind("<Leave>", lambda e: leave())
+
+    def set_state(self, state):
+        for row in self:
+            for btn in row:
+                btn.config(state=state)
+
+    def disable_cell(self, r, c):
+        self[r][c].config(state="disabled")
+
+
+def use_canvas(size):
+    renderer = os.environ.get("BATTLESHIP_RENDERER")
+    if renderer:
+        return renderer == "canvas"
+    return size > CANVAS_THRESHOLD
+
+
+def get_cell_pixels(size, widget=None):
+    """
+    Cell side in pixels so that two boards fit side by side on screen
+    (about 40% of the screen width and 60% of its height each).
+    """
+    available = 600
+    if widget is not None:
+        available = min(
+            int(widget.winfo_screenwidth() * 0.4),
+            int(widget.winfo_screenheight() * 0.6)
+        )
+    return max(2, min(40, available // size))
+
+
 def get_cell_size(size):
     if size <= 5:
         return 4, 2
@@ -10,6 +86,11 @@ def get_cell_size(size):
 
 
 def create_computer_board(parent, click_handler, size):
+    if use_canvas(size):
+        board = CanvasBoard(parent, size, get_cell_pixels(size, parent))
+        board.bind_cells(click=click_handler)
+        return board
+
     board_frame = tk.Frame(parent)
     board_frame.pack()
 
@@ -29,10 +110,13 @@ def create_computer_board(parent, click_handler, size):
             btn.grid(row=r, column=c, padx=1, pady=1)
             row.append(btn)
         buttons.append(row)
-    return buttons
+    return ButtonGrid(buttons, "blue")
 
 
 def create_player_board(parent, size):
+    if use_canvas(size):
+        return CanvasBoard(parent, size, get_cell_pixels(size, parent))
+
     board_frame = tk.Frame(parent)
     board_frame.pack()
 
@@ -51,29 +135,61 @@ def create_player_board(parent, size):
             btn.grid(row=r, column=c, padx=1, pady=1)
             row.append(btn)
         buttons.append(row)
-    return buttons
+    return ButtonGrid(buttons, "blue")
+
+
+def cell_color(player_board, r, c, sunk_cells, show_ships):
+    if (r, c) in sunk_cells:
+        return SUNK_COLOR
+    cell = player_board.cell(r, c)
+    if cell == "X":
+        return "red"
+    elif cell == "O":
+        return "green"
+    elif cell == "S" and show_ships:
+        return "gray"
+    return "blue"
 
-def update_player_board(player_board, player_buttons, sunk_cells=None, show_ships=True):
+
+def _bits(mask, cells):
+    """Mask as a string of '0' / '1' indexed by cell number."""
+    return format(mask, f"0{cells}b")[::-1]
+
+
+def update_player_board(player_board, player_buttons, sunk_cells=None,
+                        show_ships=True, changed=None):
+    """
+    Repaints the board. With `changed` (an iterable of (r, c)) only those
+    cells are looked at; otherwise every cell is checked, and only cells
+    whose color differs from the last drawn one are sent to Tk.
+    """
     if sunk_cells is None:
         sunk_cells = set()
 
+    if changed is not None:
+        for r, c in changed:
+            player_buttons.paint(
+                r, c, cell_color(player_board, r, c, sunk_cells, show_ships)
+            )
+        return
+
+    # Full pass: read each mask once instead of shifting it per cell.
     size = len(player_board)
+    cells = size * size
+    hits = _bits(player_board.hits, cells)
+    misses = _bits(player_board.misses, cells)
+    ships = _bits(player_board.ships if show_ships else 0, cells)
 
-    for r in range(size):
-        for c in range(size):
-            cell = player_board[r][c]
-            btn = player_buttons[r][c]
-
-            if (r, c) in sunk_cells:
-                btn.config(bg="#8B0000")
-            elif cell == "X":
-                btn.config(bg="red")
-            elif cell == "O":
-                btn.config(bg="green")
-            elif cell == "S":
-                if show_ships:
-                    btn.config(bg="gray")
-                else:
-                    btn.config(bg="blue")
-            else:
-                btn.config(bg="blue")
+    for index in range(cells):
+        r, c = divmod(index, size)
+        if (r, c) in sunk_cells:
+            color = SUNK_COLOR
+        elif hits[index] == "1":
+            color = "red"
+        elif misses[index] == "1":
+            color = "green"
+        elif ships[index] == "1":
+            color = "gray"
+        else:
+            color = "blue"
+        player_buttons.paint(r, c, color)
@@ -0,0 +1,126 @@
+import tkinter as tk
+
+
+class CanvasCell:
+    """
+    Stand-in for a cell button so animations can call
+    config(bg=...) and after(...) on a canvas cell.
+    """
+
+    __slots__ = ("board", "r", "c")
+
+    def __init__(self, board, r, c):
+        self.board = board
+        self.r = r
+        self.c = c
+
+    def config(self, bg=None, **_):
+        if bg is not None:
+            self.board.paint(self.r, self.c, bg)
+
+    configure = config
+
+    def after(self, ms, func=None, *args):
+        return self.board.canvas.after(ms, func, *args)
+
+
+class CanvasBoard:
+    """
+    One tk.Canvas per board with a rectangle item per cell and a single
+    click / motion handler that maps pixels to cells. Offers the same
+    paint / bind_cells / set_state interface as gui_boards.ButtonGrid,
+    without creating n*n widgets.
+    """
+
+    def __init__(self, parent, size, cell_px, color="blue"):
+        self.size = size
+        self.cell_px = cell_px
+        self.state = "normal"
+        self.config_calls = 0
+        self.click_handler = None
+        self.enter_handler = None
+        self.leave_handler = None
+        self.hover = None
+
+        side = size * cell_px + 1
+        self.canvas = tk.Canvas(
+            parent, width=side, height=side, highlightthickness=0, bg="black"
+        )
+        self.canvas.pack()
+
+        outline = "black" if cell_px >= 6 else ""
+        self.items = []
+        self.colors = []
+        for r in range(size):
+            y = r * cell_px
+            row_items = []
+            for c in range(size):
+                x = c * cell_px
+                row_items.append(self.canvas.create_rectangle(
+                    x, y, x + cell_px, y + cell_px, fill=color, outline=outline
+                ))
+            self.items.append(row_items)
+            self.colors.append([color] * size)
+
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Motion>", self._on_motion)
+        self.canvas.bind("<Leave>", self._on_leave)
+
+    def __len__(self):
+        return self.size
+
+    # ---- painting ----
+
+    def paint(self, r, c, color):
+        if self.colors[r][c] != color:
+            self.canvas.itemconfig(self.items[r][c], fill=color)
+            self.colors[r][c] = color
+            self.config_calls += 1
+
+    def pop_config_calls(self):
+        calls = self.config_calls
+        self.config_calls = 0
+        return calls
+
+    def cell(self, r, c):
+        return CanvasCell(self, r, c)
+
+    # ---- input ----
+
+    def bind_cells(self, click=None, enter=None, leave=None):
+        self.click_handler = click
+        self.enter_handler = enter
+        self.leave_handler = leave
+
+    def set_state(self, state):
+        self.state = state
+
+    def disable_cell(self, r, c):
+        # Shot cells are rejected by the game session itself.
+        pass
+
+    def _cell_at(self, event):
+        r = event.y // self.cell_px
+        c = event.x // self.cell_px
+        if 0 <= r < self.size and 0 <= c < self.size:
+            return r, c
+        return None
+
+    def _on_click(self, event):
+        cell = self._cell_at(event)
+        if cell is not None and self.state == "normal" and self.click_handler:
+            self.click_handler(*cell)
+
+    def _on_motion(self, event):
+        cell = self._cell_at(event)
+        if cell == self.hover:
+            return
+        self._on_leave(event)
+        self.hover = cell
+        if cell is not None and self.enter_handler:
+            self.enter_handler(*cell)
+
+    def _on_leave(self, event):
+        if self.hover is not None and self.leave_handler:
+            self.leave_handler()
+        self.hover = None
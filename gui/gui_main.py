@@ -1,90 +1,134 @@
+import time
+
+# Taken before the other imports so the startup report covers them.
+STARTED = time.perf_counter()
+
+import os
+import random
+import sys
+import threading
 import tkinter as tk
 from tkinter import messagebox
 
-from board import create_board, all_ships_sunk
-from ships import place_all_ships, can_place_ship
-from attacks import attack, is_valid_attack
-from ai import generate_hunt_cells, ai_turn
+import profiling
+from ai import DIFFICULTIES, SLOW_DIFFICULTIES, preload_engine
+from game import (
+    GameSession,
+    SHIP_CONFIGS,
+    MIN_BOARD_SIZE,
+    MAX_BOARD_SIZE,
+    COMPUTER,
+    PLAYER,
+    fleet_for_size,
+    shot_cells
+)
+from savegame import SAVE_PATH, save_game, load_game
 
 from gui.gui_boards import (
     create_computer_board,
     create_player_board,
-    update_player_board
+    update_player_board,
+    cell_color
 )
 from gui.gui_status import update_counters
-from gui.animations import hit_animation, miss_animation
+from gui.animations import Animator, SPEEDS, hit_animation, miss_animation
+from gui.ai_worker import AIWorker
+
+# Set BATTLESHIP_RENDER_STATS=1 to print Tk config calls per turn.
+RENDER_STATS = bool(os.environ.get("BATTLESHIP_RENDER_STATS"))
+
+# Played by the AI worker when a slow move misses its deadline.
+FALLBACK_DIFFICULTY = "Medium"
+
+# Computer fleet placement: seconds spent searching for a layout the AI
+# finds hard (see placement.py); 0 places it at random.
+PLACEMENT_MODES = {"Random": 0, "Devious": 1.0, "Very devious": 3.0}
 
 
 class BattleshipGUI:
 
     # ================= INITIALIZATION =================
 
-    def __init__(self):
+    def __init__(self, exit_after_first_frame=False):
+        self.exit_after_first_frame = exit_after_first_frame
         self.legend_shown_once = False
         self.legend_overlay = None
         self.legend_visible = False
         self.root = tk.Tk()
         self.root.title("Battleship")
         self.root.state("zoomed")
-
-        self.ship_configs = {
-            5: [3, 2],
-            7: [4, 3, 2],
-            10: [5, 4, 3, 3, 2]
-        }
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.board_size_var = tk.IntVar(value=5)
         self.difficulty_var = tk.StringVar(value="Hard")
+        self.animation_var = tk.StringVar(value="Normal")
+        self.placement_var = tk.StringVar(value="Random")
+        self.animator = Animator(self.root)
+        self.ai_worker = AIWorker(self.root)
 
         self.preview_cells = []
         self.animating = False
         self.board_size = 5
+        self.session = None
+        self.devious = None
+
+        # Navigation screens are built on first use and kept; the game
+        # screen is rebuilt for every game since the boards change.
+        self.screens = {}
+        self.game_frame = None
 
         self.show_start_screen()
+        self.root.after_idle(self.on_first_frame)
         self.root.mainloop()
 
+    def on_first_frame(self):
+        if self.exit_after_first_frame:
+            print(f"first frame: {(time.perf_counter() - STARTED) * 1000:.1f} ms")
+            self.root.destroy()
+
     # ================= GAME SETUP =================
 
-    def setup_game(self):
+    def setup_game(self, session=None):
+        # A saved session is resumed as is; otherwise a new game starts.
+        self.animator.cancel_all()
+        self.ai_worker.cancel()
         self.animating = False
         self.preview_cells.clear()
+        self.close_legend()
+        self.hide_screens()
+
+        if session is None:
+            self.board_size = self.selected_board_size()
+            # Own generator so a saved game resumes with the same stream.
+            session = GameSession(
+                self.board_size,
+                fleet_for_size(self.board_size),
+                self.difficulty_var.get(),
+                rng=random.Random()
+            )
+        else:
+            self.board_size = session.board_size
+            self.board_size_var.set(session.board_size)
+            self.difficulty_var.set(session.difficulty)
+
+        self.session = session
+        self.start_devious_placement(session)
+        # Import the engine for this difficulty off the main thread.
+        threading.Thread(
+            target=preload_engine, args=(session.difficulty,), daemon=True
+        ).start()
+        self.player_board = self.session.player_board
+        self.computer_board = self.session.computer_board
 
-        for w in self.root.winfo_children():
-            w.destroy()
-
-        self.board_size = self.board_size_var.get()
-
-        self.player_board = create_board(self.board_size)
-        self.computer_board = create_board(self.board_size)
-
-        self.player_ships = []
-        self.computer_ships = []
-        self.sunk_player_ships = set()
-        self.sunk_computer_ships = set()
-
-        place_all_ships(
-            self.computer_board,
-            self.ship_configs[self.board_size],
-            self.computer_ships
-        )
-
-        self.ships_to_place = self.ship_configs[self.board_size]
-        self.current_ship_index = 0
         self.current_orientation = "H"
-        self.placement_phase = True
-
-        self.ai_state = {
-            "mode": "hunt",
-            "hunt_cells": generate_hunt_cells(self.board_size),
-            "targets": []
-        }
+        self.config_calls_per_turn = []
 
+        self.game_frame = tk.Frame(self.root, padx=20, pady=10)
+        self.game_frame.place(relwidth=1, relheight=1)
         self.build_ui()
         self.refresh_ui()
+        self.restore_controls()
 
-        self.status.config(
-            text=f"Place ship of size {self.ships_to_place[0]}"
-        )
         # ---- AUTO SHOW LEGEND ONCE ----
         if not self.legend_shown_once:
             self.root.after(400, self.show_legend_popup)
@@ -97,22 +141,19 @@ class BattleshipGUI:
 
     # ================= UI =================
     def build_ui(self):
-        # ================= ROOT LAYOUT =================
-        self.root.configure(padx=20, pady=10)
-
         # ---------- TOP CONTROLS (VERTICAL, CENTERED) ----------
-        top_controls = tk.Frame(self.root)
+        top_controls = tk.Frame(self.game_frame)
         top_controls.pack(side="top", pady=10)
 
         tk.Button(
-            self.root,
+            self.game_frame,
             text="← Back to Start",
             font=("Arial", 12),
             command=self.back_to_start
         ).place(relx=0.98, rely=0.03, anchor="ne")
 
         tk.Button(
-            self.root,
+            self.game_frame,
             text="❓Info",
             font=("Arial", 12),
             width=5,
@@ -120,8 +161,13 @@ class BattleshipGUI:
         ).place(relx=0.98, rely=0.08, anchor="ne")
 
         tk.Label(top_controls, text="Board Size", font=("Arial", 12)).pack()
-        self.board_size_menu = tk.OptionMenu(
-            top_controls, self.board_size_var, 5, 7, 10
+        self.board_size_menu = tk.Spinbox(
+            top_controls,
+            from_=MIN_BOARD_SIZE,
+            to=MAX_BOARD_SIZE,
+            textvariable=self.board_size_var,
+            width=5,
+            font=("Arial", 12)
         )
         self.board_size_menu.pack(pady=2)
 
@@ -129,7 +175,16 @@ class BattleshipGUI:
         tk.OptionMenu(
             top_controls,
             self.difficulty_var,
-            "Easy", "Medium", "Hard"
+            *DIFFICULTIES,
+            command=self.on_difficulty_change
+        ).pack(pady=2)
+
+        tk.Label(top_controls, text="Animation", font=("Arial", 12)).pack()
+        tk.OptionMenu(
+            top_controls,
+            self.animation_var,
+            *SPEEDS,
+            command=self.on_animation_change
         ).pack(pady=2)
 
         self.orientation_btn = tk.Button(
@@ -141,7 +196,7 @@ class BattleshipGUI:
         self.orientation_btn.pack(pady=6)
 
         # ---------- BOARDS (CENTER, EXPANDABLE) ----------
-        boards_container = tk.Frame(self.root)
+        boards_container = tk.Frame(self.game_frame)
         boards_container.pack(expand=True)
 
         container = tk.Frame(boards_container)
@@ -160,9 +215,7 @@ class BattleshipGUI:
         self.computer_buttons = create_computer_board(
             comp, self.on_computer_click, self.board_size
         )
-        for row in self.computer_buttons:
-            for btn in row:
-                btn.config(state="disabled")
+        self.computer_buttons.set_state("disabled")
 
         # ---- PLAYER BOARD ----
         player = tk.Frame(container)
@@ -175,22 +228,18 @@ class BattleshipGUI:
         self.player_result.pack(pady=5)
 
         self.player_buttons = create_player_board(player, self.board_size)
-
-        for r in range(self.board_size):
-            for c in range(self.board_size):
-                btn = self.player_buttons[r][c]
-                btn.config(
-                    command=lambda r=r, c=c: self.on_player_place_click(r, c)
-                )
-                btn.bind("<Enter>", lambda e, r=r, c=c: self.show_preview(r, c))
-                btn.bind("<Leave>", lambda e: self.clear_preview())
+        self.player_buttons.bind_cells(
+            click=self.on_player_place_click,
+            enter=self.show_preview,
+            leave=self.clear_preview
+        )
 
         # ---------- STATUS ----------
-        self.status = tk.Label(self.root, text="", font=("Arial", 14))
+        self.status = tk.Label(self.game_frame, text="", font=("Arial", 14))
         self.status.pack(pady=8)
 
         # ---------- BOTTOM CONTROLS (ALWAYS VISIBLE) ----------
-        bottom_bar = tk.Frame(self.root)
+        bottom_bar = tk.Frame(self.game_frame)
         bottom_bar.pack(side="bottom", pady=12)
 
         tk.Button(
@@ -211,19 +260,36 @@ class BattleshipGUI:
         )
         self.finish_btn.pack()
 
+        self.auto_place_btn = tk.Button(
+            bottom_bar,
+            text="Auto Place Ships",
+            font=("Arial", 12),
+            width=18,
+            command=self.auto_place
+        )
+        self.auto_place_btn.pack(pady=(6, 0))
+
+        tk.Button(
+            bottom_bar,
+            text="Save Game",
+            font=("Arial", 12),
+            width=18,
+            command=self.save_game
+        ).pack(pady=(6, 0))
+
 
     # ================= PLACEMENT PREVIEW =================
 
     def show_preview(self, row, col):
-        if not self.placement_phase:
+        if not self.session.placement_phase:
             return
 
         self.clear_preview()
-        ship_size = self.ships_to_place[self.current_ship_index]
+        ship_size = self.session.next_ship_size
+        if ship_size is None:
+            return
 
-        valid = can_place_ship(
-            self.player_board, row, col, ship_size, self.current_orientation
-        )
+        valid = self.session.can_place(row, col, self.current_orientation)
         color = "lightgreen" if valid else "pink"
 
         cells = (
@@ -234,97 +300,120 @@ class BattleshipGUI:
 
         for r, c in cells:
             if 0 <= r < self.board_size and 0 <= c < self.board_size:
-                self.player_buttons[r][c].config(bg=color)
+                self.player_buttons.paint(r, c, color)
                 self.preview_cells.append((r, c))
 
     def clear_preview(self):
         for r, c in self.preview_cells:
-            cell = self.player_board[r][c]
-            self.player_buttons[r][c].config(
-                bg="gray" if cell == "S" else "blue"
+            self.player_buttons.paint(
+                r, c, cell_color(self.player_board, r, c, (), True)
             )
         self.preview_cells.clear()
 
     # ================= PLACEMENT =================
 
     def on_player_place_click(self, row, col):
-        if not self.placement_phase:
+        if not self.session.placement_phase:
             return
 
         self.clear_preview()
-        ship_size = self.ships_to_place[self.current_ship_index]
 
-        if not can_place_ship(
-            self.player_board, row, col, ship_size, self.current_orientation
-        ):
+        cells = self.session.place_player_ship(
+            row, col, self.current_orientation
+        )
+        if cells is None:
             self.status.config(text="Invalid placement!")
             return
 
-        cells = []
-
-        if self.current_orientation == "H":
-            for i in range(ship_size):
-                self.player_board[row][col + i] = "S"
-                cells.append((row, col + i))
-        else:
-            for i in range(ship_size):
-                self.player_board[row + i][col] = "S"
-                cells.append((row + i, col))
-
-        self.player_ships.append(cells)
-
-        self.current_ship_index += 1
-        self.refresh_ui()
+        self.refresh_ui(player_changed=cells, computer_changed=())
 
-        if self.current_ship_index == len(self.ships_to_place):
+        if self.session.all_ships_placed:
             self.status.config(text="All ships placed. Click Finish Placement.")
             self.finish_btn.config(state="normal")
         else:
             self.status.config(
-                text=f"Place ship of size {self.ships_to_place[self.current_ship_index]}"
+                text=f"Place ship of size {self.session.next_ship_size}"
             )
 
         if self.legend_visible:
             return
 
+    def auto_place(self):
+        if not self.session.placement_phase or self.session.all_ships_placed:
+            return
+        self.clear_preview()
+        self.session.auto_place_player()
+        self.refresh_ui(computer_changed=())
+        self.status.config(text="All ships placed. Click Finish Placement.")
+        self.finish_btn.config(state="normal")
+
     def finish_placement(self):
-        self.placement_phase = False
+        self.apply_devious_placement()
+        self.session.finish_placement()
+        self.start_battle()
+
+    def start_devious_placement(self, session):
+        """Searches for the computer's fleet on a thread while the player places theirs."""
+        self.devious = None
+        budget = PLACEMENT_MODES[self.placement_var.get()]
+        if not budget or not session.placement_phase:
+            return
+        # Own generator: the session's is used on the main thread meanwhile.
+        rng = random.Random(session.rng.getrandbits(64))
+        devious = {"session": session, "layout": None}
+
+        def run():
+            from placement import devious_layout
+            devious["layout"] = devious_layout(
+                session.board_size, session.ship_sizes, rng, budget
+            )
+
+        devious["thread"] = threading.Thread(target=run, daemon=True)
+        devious["thread"].start()
+        self.devious = devious
+
+    def apply_devious_placement(self):
+        devious, self.devious = self.devious, None
+        if devious is None or devious["session"] is not self.session:
+            return
+        if devious["thread"].is_alive():
+            # Waits at most the rest of the search budget.
+            self.status.config(text="The computer is hiding its fleet...")
+            self.root.config(cursor="watch")
+            self.root.update_idletasks()
+            devious["thread"].join()
+            self.root.config(cursor="")
+        if devious["layout"] is not None:
+            self.session.place_computer_fleet(devious["layout"])
+            self.computer_board = self.session.computer_board
+
+    def start_battle(self):
+        self.auto_place_btn.config(state="disabled")
         self.orientation_btn.config(state="disabled")
         self.finish_btn.config(state="disabled")
         self.clear_preview()
+        self.player_buttons.pop_config_calls()
+        self.computer_buttons.pop_config_calls()
 
-        for row in self.player_buttons:
-            for btn in row:
-                btn.config(state="disabled")
-        for row in self.computer_buttons:
-            for btn in row:
-                btn.config(state="normal")
+        self.player_buttons.set_state("disabled")
+        self.computer_buttons.set_state("normal")
 
         self.status.config(text="Your turn!")
 
-    def is_ship_sunk(self, ship, board):
-        return all(board[r][c] == "X" for r, c in ship)
-
     # ================= GAME FLOW =================
 
     def on_computer_click(self, row, col):
-        if self.animating or self.placement_phase:
-            return
-        if not is_valid_attack(self.computer_board, row, col):
+        if self.animating or not self.session.can_fire(row, col):
             return
 
         self.animating = True
-        hit = attack(self.computer_board, row, col)
-        btn = self.computer_buttons[row][col]
-
-        for idx, ship in enumerate(self.computer_ships):
-            if idx not in self.sunk_computer_ships:
-                if self.is_ship_sunk(ship, self.computer_board):
-                    self.sunk_computer_ships.add(idx)
+        hit = self.session.player_move(row, col)
+        btn = self.computer_buttons.cell(row, col)
+        changed = shot_cells(self.computer_board, (row, col), hit)
 
         def after_player():
-            self.refresh_ui()
-            if all_ships_sunk(self.computer_board):
+            self.refresh_ui(player_changed=(), computer_changed=changed)
+            if self.session.is_over:
                 self.end_game("🎉 You win!")
             else:
                 self.ai_move()
@@ -332,80 +421,190 @@ class BattleshipGUI:
         if self.legend_visible:
             return
 
-        (hit_animation if hit else miss_animation)(btn, on_finish=after_player)
-        self.comp_result.config(text="Hit!" if hit else "Miss!")
-        btn.config(state="disabled")
+        (hit_animation if hit else miss_animation)(
+            btn, on_finish=self.timed_wait("animation_wait", after_player),
+            animator=self.animator
+        )
+        self.comp_result.config(
+            text="Sunk!" if hit.sunk else "Hit!" if hit else "Miss!"
+        )
+        self.computer_buttons.disable_cell(row, col)
 
     def ai_move(self):
-        self.ai_state, move, hit = ai_turn(
-            self.player_board, self.ai_state, self.difficulty_var.get()
+        session = self.session
+        if session.difficulty not in SLOW_DIFFICULTIES:
+            self.apply_ai_move(session.choose_ai_move())
+            return
+
+        # The worker reads a copy of the board; if it misses the deadline
+        # a cheap hunt move is played instead.
+        board = session.player_board.copy()
+        self.status.config(text="Computer is thinking…")
+        self.ai_worker.submit(
+            lambda: session.choose_ai_move(board),
+            self.timed_wait("ai_wait", self.apply_ai_move),
+            fallback=lambda: session.choose_ai_move(difficulty=FALLBACK_DIFFICULTY)
         )
 
+    def apply_ai_move(self, move):
+        hit = self.session.play_ai_move(move)
+
         if move is None:
             self.animating = False
             return
 
         r, c = move
-        btn = self.player_buttons[r][c]
+        btn = self.player_buttons.cell(r, c)
+        changed = shot_cells(self.player_board, move, hit)
 
         def after_ai():
-            self.refresh_ui()
+            self.refresh_ui(player_changed=changed, computer_changed=())
+            self.record_render_stats()
 
-            for idx, ship in enumerate(self.player_ships):
-                if idx not in self.sunk_player_ships:
-                    if self.is_ship_sunk(ship, self.player_board):
-                        self.sunk_player_ships.add(idx)
-
-            if all_ships_sunk(self.player_board):
+            if self.session.is_over:
                 self.end_game("💀 You lost!")
                 return
 
             self.status.config(text="Your turn!")
             self.animating = False
 
-        (hit_animation if hit else miss_animation)(btn, on_finish=after_ai)
+        (hit_animation if hit else miss_animation)(
+            btn, on_finish=self.timed_wait("animation_wait", after_ai),
+            animator=self.animator
+        )
 
     # ================= HELPERS =================
 
-    def refresh_ui(self):
-        # ---- PLAYER BOARD ----
-        player_sunk_cells = set()
-        for idx in self.sunk_player_ships:
-            player_sunk_cells.update(self.player_ships[idx])
-
-        update_player_board(
-            self.player_board,
-            self.player_buttons,
-            player_sunk_cells,
-            show_ships=True
-        )
+    def refresh_ui(self, player_changed=None, computer_changed=None):
+        # Changed-cell lists limit repainting to what the last move touched;
+        # None checks every cell of that board.
+
+        with profiling.span("refresh_ui"):
+            # ---- PLAYER BOARD ----
+            with profiling.span("update_player_board"):
+                update_player_board(
+                    self.player_board,
+                    self.player_buttons,
+                    self.player_board.fleet.sunk_cells,
+                    show_ships=True,
+                    changed=player_changed
+                )
 
-        # ---- COMPUTER BOARD ----
-        computer_sunk_cells = set()
-        for idx in self.sunk_computer_ships:
-            computer_sunk_cells.update(self.computer_ships[idx])
-
-        update_player_board(
-            self.computer_board,
-            self.computer_buttons,
-            computer_sunk_cells,
-            show_ships=False
-        )
+            # ---- COMPUTER BOARD ----
+            with profiling.span("update_player_board"):
+                update_player_board(
+                    self.computer_board,
+                    self.computer_buttons,
+                    self.computer_board.fleet.sunk_cells,
+                    show_ships=False,
+                    changed=computer_changed
+                )
+
+            # ---- COUNTERS ----
+            with profiling.span("update_counters"):
+                update_counters(
+                    self.player_board,
+                    self.computer_board,
+                    self.player_counter,
+                    self.comp_counter
+                )
+
+    def timed_wait(self, stage, callback):
+        """Wraps a callback so the time until it runs is recorded as `stage`."""
+        if not profiling.ENABLED:
+            return callback
+        began = profiling.now()
+
+        def finish(*args):
+            profiling.record(stage, began)
+            callback(*args)
+
+        return finish
 
-        # ---- COUNTERS ----
-        update_counters(
-            self.player_board,
-            self.computer_board,
-            self.player_counter,
-            self.comp_counter
+    def record_render_stats(self):
+        calls = (
+            self.player_buttons.pop_config_calls()
+            + self.computer_buttons.pop_config_calls()
         )
+        self.config_calls_per_turn.append(calls)
+        if RENDER_STATS:
+            print(f"turn {len(self.config_calls_per_turn)}: {calls} Tk config calls")
 
     def end_game(self, message):
+        if os.path.exists(SAVE_PATH):
+            os.remove(SAVE_PATH)  # nothing left to resume
         self.animating = False
         self.status.config(text=message)
-        for row in self.computer_buttons + self.player_buttons:
-            for btn in row:
-                btn.config(state="disabled")
+        self.computer_buttons.set_state("disabled")
+        self.player_buttons.set_state("disabled")
+        profiling.report()
+
+    def restore_controls(self):
+        """Puts buttons and status in line with the session's phase."""
+        session = self.session
+        if session.placement_phase:
+            if session.all_ships_placed:
+                self.status.config(text="All ships placed. Click Finish Placement.")
+                self.finish_btn.config(state="normal")
+            else:
+                self.status.config(
+                    text=f"Place ship of size {session.next_ship_size}"
+                )
+            return
+
+        self.start_battle()
+        if session.winner == PLAYER:
+            self.end_game("🎉 You win!")
+        elif session.winner == COMPUTER:
+            self.end_game("💀 You lost!")
+        elif session.turn == COMPUTER:
+            self.animating = True
+            self.ai_move()
+
+    # ================= SAVE / RESUME =================
+
+    def save_game(self):
+        if self.session is None or self.session.is_over:
+            return
+        try:
+            save_game(self.session)
+        except OSError as e:
+            messagebox.showerror("Save Game", f"Could not save the game:\n{e}")
+            return
+        self.status.config(text="Game saved.")
+
+    def resume_game(self):
+        try:
+            session = load_game()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Resume Game", f"Could not load the saved game:\n{e}")
+            return
+        self.setup_game(session)
+
+    def on_close(self):
+        self.ai_worker.cancel()
+        if self.session is not None and not self.session.is_over:
+            try:
+                save_game(self.session)
+            except OSError:
+                pass
+        self.root.destroy()
+
+    def selected_board_size(self):
+        try:
+            size = self.board_size_var.get()
+        except tk.TclError:
+            size = MIN_BOARD_SIZE
+        size = max(MIN_BOARD_SIZE, min(MAX_BOARD_SIZE, size))
+        self.board_size_var.set(size)
+        return size
+
+    def on_difficulty_change(self, difficulty):
+        self.session.difficulty = difficulty
+        threading.Thread(target=preload_engine, args=(difficulty,), daemon=True).start()
+
+    def on_animation_change(self, speed):
+        self.animator.speed = SPEEDS[speed]
 
     def toggle_orientation(self):
         self.current_orientation = "V" if self.current_orientation == "H" else "H"
@@ -500,11 +699,31 @@ class BattleshipGUI:
 
     # ================= START SCREENS =================
 
+    def hide_screens(self):
+        for frame in self.screens.values():
+            frame.place_forget()
+        if self.game_frame is not None:
+            self.game_frame.destroy()
+            self.game_frame = None
+
+    def show_screen(self, name, build):
+        self.hide_screens()
+        frame = self.screens.get(name)
+        if frame is None:
+            frame = tk.Frame(self.root)
+            build(frame)
+            self.screens[name] = frame
+        frame.place(relwidth=1, relheight=1)
+
     def show_start_screen(self):
-        for w in self.root.winfo_children():
-            w.destroy()
+        self.show_screen("start", self.build_start_screen)
+        if os.path.exists(SAVE_PATH):
+            self.resume_btn.pack()
+        else:
+            self.resume_btn.pack_forget()
 
-        center = tk.Frame(self.root)
+    def build_start_screen(self, frame):
+        center = tk.Frame(frame)
         center.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
@@ -521,17 +740,27 @@ class BattleshipGUI:
             command=self.show_board_size_screen
         ).pack(pady=30)
 
+        self.resume_btn = tk.Button(
+            center,
+            text="Resume Game",
+            font=("Arial", 18),
+            width=18,
+            height=2,
+            command=self.resume_game
+        )
+
     def show_board_size_screen(self):
-        for w in self.root.winfo_children():
-            w.destroy()
+        self.show_screen("board_size", self.build_board_size_screen)
+
+    def build_board_size_screen(self, frame):
         tk.Button(
-            self.root,
+            frame,
             text="← Back",
             font=("Arial", 12),
             command=self.show_start_screen
         ).place(relx=0.02, rely=0.05, anchor="nw")
 
-        center = tk.Frame(self.root)
+        center = tk.Frame(frame)
         center.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
@@ -539,7 +768,7 @@ class BattleshipGUI:
             font=("Arial", 22, "bold")
         ).pack(pady=20)
 
-        for size in (5, 7, 10):
+        for size in sorted(SHIP_CONFIGS):
             tk.Radiobutton(
                 center,
                 text=f"{size} × {size}",
@@ -551,6 +780,22 @@ class BattleshipGUI:
                 pady=8
             ).pack(pady=6)
 
+        custom = tk.Frame(center)
+        custom.pack(pady=6)
+        tk.Label(
+            custom,
+            text=f"Custom ({MIN_BOARD_SIZE}–{MAX_BOARD_SIZE}):",
+            font=("Arial", 14)
+        ).pack(side="left", padx=(0, 8))
+        tk.Spinbox(
+            custom,
+            from_=MIN_BOARD_SIZE,
+            to=MAX_BOARD_SIZE,
+            textvariable=self.board_size_var,
+            width=5,
+            font=("Arial", 14)
+        ).pack(side="left")
+
         tk.Button(
             center,
             text="Next",
@@ -560,17 +805,17 @@ class BattleshipGUI:
         ).pack(pady=25)
 
     def show_difficulty_screen(self):
-        for w in self.root.winfo_children():
-            w.destroy()
+        self.show_screen("difficulty", self.build_difficulty_screen)
 
+    def build_difficulty_screen(self, frame):
         tk.Button(
-            self.root,
+            frame,
             text="← Back",
             font=("Arial", 12),
             command=self.show_board_size_screen
         ).place(relx=0.02, rely=0.05, anchor="nw")
 
-        center = tk.Frame(self.root)
+        center = tk.Frame(frame)
         center.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
@@ -578,7 +823,7 @@ class BattleshipGUI:
             font=("Arial", 22, "bold")
         ).pack(pady=20)
 
-        for level in ("Easy", "Medium", "Hard"):
+        for level in DIFFICULTIES:
             tk.Radiobutton(
                 center,
                 text=level,
@@ -590,6 +835,9 @@ class BattleshipGUI:
                 pady=8
             ).pack(pady=6)
 
+        tk.Label(center, text="Computer Fleet", font=("Arial", 14)).pack(pady=(20, 4))
+        tk.OptionMenu(center, self.placement_var, *PLACEMENT_MODES).pack()
+
         tk.Button(
             center,
             text="Start Game",
@@ -601,11 +849,73 @@ class BattleshipGUI:
     def back_to_start(self):
         if not messagebox.askyesno(
             "Exit Game",
-            "Return to start screen? Current game will be lost."
+            "Return to start screen? The game is saved so you can resume it."
         ):
             return
+        self.animator.cancel_all()
+        self.ai_worker.cancel()
+        self.save_game()
+        self.session = None
         self.animating = False
         self.show_start_screen()
 
+# ================= STARTUP REPORT =================
+
+def startup_report(top=15):
+    """
+    Starts the GUI in a child process with -X importtime, lets it exit
+    after its first frame and prints import and first-frame times.
+    """
+    import subprocess
+
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    began = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "gui.gui_main", "--first-frame-exit"],
+        cwd=root_dir, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - began
+
+    imports = []
+    for line in child.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative_us), int(self_us), name.rstrip()))
+
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for cumulative_us, self_us, name in sorted(imports, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>13.1f} {self_us / 1000:>8.1f}  {name}")
+    total = sum(self_us for _, self_us, _ in imports)
+    print(f"\n{len(imports)} modules imported in {total / 1000:.1f} ms")
+
+    first_frame = [l for l in child.stdout.splitlines() if l.startswith("first frame")]
+    if first_frame:
+        print(f"{first_frame[0]} after gui_main started, "
+              f"{wall * 1000:.1f} ms including interpreter start")
+    else:
+        print("no first frame (is a display available?)")
+        print(child.stderr.strip().splitlines()[-1] if child.stderr.strip() else "")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Battleship")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print import and first-frame times, then exit")
+    parser.add_argument("--profile", nargs="?", const=profiling.TRACE_PATH, metavar="TRACE",
+                        help="time every turn stage; summary and Chrome trace at game end")
+    parser.add_argument("--first-frame-exit", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiling.enable(args.profile)
+    if args.startup_report:
+        startup_report()
+    else:
+        BattleshipGUI(exit_after_first_frame=args.first_frame_exit)
+
+
 if __name__ == "__main__":
-    BattleshipGUI()
\ No newline at end of file
+    main()
\ No newline at end of file
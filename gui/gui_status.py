@@ -1,10 +1,9 @@
 # gui_status.py
 def update_counters(player_board, computer_board, player_label, computer_label):
-    comp_hits = sum(row.count("X") for row in computer_board)
-    comp_safe = sum(row.count("S") for row in computer_board)
+    comp_hits = computer_board.hit_count()
+    comp_safe = computer_board.remaining_count()
     computer_label.config(text=f"Hits: {comp_hits} | Remaining: {comp_safe}")
 
-    player_hits = sum(row.count("X") for row in player_board)
-    player_safe = sum(row.count("S") for row in player_board)
+    player_hits = player_board.hit_count()
+    player_safe = player_board.remaining_count()
     player_label.config(text=f"Hits: {player_hits} | Remaining: {player_safe}")
-
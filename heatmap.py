@@ -0,0 +1,204 @@
+"""
+Probability-density heatmaps for the Expert AI (needs NumPy).
+
+Imported lazily by ai.py the first time an Expert move is needed, so
+starting the game does not pay for NumPy.
+"""
+
+import random
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+# Placements that already cover a known hit are this many times more
+# likely to be the real ship than a placement over open water.
+HIT_WEIGHT = 100
+
+# Heatmaps kept by the transposition table, and the largest board whose
+# heatmaps are cached at all (bigger boards rarely repeat a position).
+HEATMAP_CACHE_SIZE = 10000
+HEATMAP_CACHE_MAX_BOARD = 20
+
+
+# ---------- PROBABILITY DENSITY (EXPERT) ----------
+
+def mask_to_array(mask, board_size):
+    cells = board_size * board_size
+    raw = np.frombuffer(mask.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:cells].reshape(board_size, board_size)
+
+
+def _window_sums(grid, length):
+    """Sum of every horizontal run of `length` cells, shape (n, n - length + 1)."""
+    csum = np.zeros((grid.shape[0], grid.shape[1] + 1), dtype=np.int64)
+    np.cumsum(grid, axis=1, out=csum[:, 1:])
+    return csum[:, length:] - csum[:, :-length]
+
+
+def _spread(weights, length, board_size):
+    """Adds each placement's weight to every cell it covers."""
+    csum = np.zeros((weights.shape[0], weights.shape[1] + 1), dtype=weights.dtype)
+    np.cumsum(weights, axis=1, out=csum[:, 1:])
+    cols = np.arange(board_size)
+    high = np.minimum(cols, board_size - length) + 1
+    low = np.maximum(cols - length + 1, 0)
+    return csum[:, high] - csum[:, low]
+
+
+def _placement_density(blocked, hits, length, board_size):
+    valid = _window_sums(blocked, length) == 0
+    weights = valid * (1 + HIT_WEIGHT * _window_sums(hits, length))
+    return _spread(weights, length, board_size)
+
+
+def density_heatmap(board_size, blocked, hits, ship_sizes):
+    """
+    Counts, for every cell, the ship placements consistent with the
+    observations that cover it. `blocked` marks misses and sunk ships,
+    `hits` marks hits on ships that are still afloat (both 0/1 arrays).
+    """
+    heat = np.zeros((board_size, board_size), dtype=np.int64)
+    for length in set(ship_sizes):
+        if length > board_size:
+            continue
+        count = ship_sizes.count(length)
+        heat += count * _placement_density(blocked, hits, length, board_size)
+        heat += count * _placement_density(blocked.T, hits.T, length, board_size).T
+    return heat
+
+
+def board_observation(board):
+    """
+    What the shooter is allowed to know about a board:
+    blocked cells, hits on unsunk ships, shot cells and remaining ship sizes.
+    """
+    board_size = len(board)
+    sunk = board.fleet.sunk_mask
+    blocked = mask_to_array(board.misses | sunk, board_size)
+    hits = mask_to_array(board.hits & ~sunk, board_size)
+    shots = board.hits | board.misses
+    return blocked, hits, shots, board.fleet.remaining_sizes()
+
+
+def best_cell(heat, shots, board_size, rng):
+    flat = heat.ravel().astype(np.float64)
+    flat[mask_to_array(shots, board_size).ravel().astype(bool)] = -1.0
+    best = np.flatnonzero(flat == flat.max())
+    return divmod(int(best[rng.randrange(len(best))]), board_size)
+
+
+def expert_shot(board, rng=None):
+    if rng is None:
+        rng = random
+    board_size = len(board)
+    blocked, hits, shots, ship_sizes = board_observation(board)
+    heat = cached_heatmap(board_size, blocked, hits, ship_sizes)
+    return best_cell(heat, shots, board_size, rng)
+
+
+# ---------- TRANSPOSITION TABLE ----------
+
+class TranspositionTable:
+    """
+    Size-bounded LRU map from canonical observation keys to results,
+    counting hits, misses and evictions. Safe to share between threads
+    (the game server computes moves on a thread pool).
+    """
+
+    def __init__(self, maxsize=HEATMAP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+HEATMAP_CACHE = TranspositionTable()
+
+
+def _symmetry(grid, k):
+    """k-th of the 8 board symmetries: optional transpose, then k % 4 quarter turns."""
+    if k & 4:
+        grid = grid.T
+    return np.rot90(grid, k & 3)
+
+
+@lru_cache(maxsize=None)
+def _symmetry_tables(board_size):
+    """
+    Flat index permutations for the 8 symmetries, shape (8, n * n), and
+    their inverses: grid.ravel()[perms[k]] is _symmetry(grid, k).ravel().
+    """
+    cells = np.arange(board_size * board_size).reshape(board_size, board_size)
+    perms = np.stack([_symmetry(cells, k).ravel() for k in range(8)])
+    inverse = np.argsort(perms, axis=1)
+    return perms, inverse
+
+
+def canonical_key(board_size, blocked, hits, ship_sizes):
+    """
+    Key shared by all 8 rotations / reflections of an observation,
+    plus the symmetry that maps this observation onto the canonical one.
+    """
+    perms, _ = _symmetry_tables(board_size)
+    state = (blocked.ravel() | hits.ravel() << 1).astype(np.uint8)[perms]
+    rows = [row.tobytes() for row in state]
+    k = min(range(8), key=rows.__getitem__)
+    return (board_size, tuple(sorted(ship_sizes)), rows[k]), k
+
+
+def cached_heatmap(board_size, blocked, hits, ship_sizes, table=HEATMAP_CACHE):
+    """density_heatmap through the transposition table."""
+    if table is None or board_size > HEATMAP_CACHE_MAX_BOARD:
+        return density_heatmap(board_size, blocked, hits, ship_sizes)
+
+    key, k = canonical_key(board_size, blocked, hits, ship_sizes)
+    perms, inverse = _symmetry_tables(board_size)
+    canonical = table.get(key)
+    if canonical is not None:
+        return canonical[inverse[k]].reshape(board_size, board_size)
+
+    # The heatmap follows the board's symmetries, so it is stored in
+    # the canonical orientation and mapped back on every hit.
+    heat = density_heatmap(board_size, blocked, hits, ship_sizes)
+    table.put(key, heat.ravel()[perms[k]])
+    return heat
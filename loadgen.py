@@ -0,0 +1,134 @@
+"""
+Load generator for the game server.
+
+Opens many connections at once, each playing back-to-back games with
+random shots, and reports how many sessions were held open, moves per
+second and the latency of a FIRE round trip (the player's shot plus
+the computer's reply).
+
+    python -m server &
+    python -m loadgen --sessions 1000 --size 10 --difficulty Hard --duration 10
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from server import HOST, PORT
+
+
+class Stats:
+    def __init__(self):
+        self.connected = 0
+        self.peak = 0
+        self.failed = 0
+        self.games = 0
+        self.moves = 0
+        self.latencies = []
+        self.errors = []
+
+
+async def request(reader, writer, line):
+    writer.write(line.encode("ascii") + b"\n")
+    await writer.drain()
+    reply = (await reader.readline()).decode("ascii").split()
+    if not reply:
+        raise ConnectionError("server closed the connection")
+    if reply[0] != "OK":
+        raise RuntimeError(f"{line!r} -> {' '.join(reply)}")
+    return reply[1:]
+
+
+async def play_session(host, port, board_size, difficulty, deadline, rng, stats, started):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        started.release()
+        return
+    stats.connected += 1
+    stats.peak = max(stats.peak, stats.connected)
+    started.release()
+
+    try:
+        while time.perf_counter() < deadline:
+            await request(reader, writer, f"NEW {board_size} {difficulty}")
+            await request(reader, writer, "AUTO")
+            await request(reader, writer, "START")
+
+            cells = [(r, c) for r in range(board_size) for c in range(board_size)]
+            rng.shuffle(cells)
+            for row, col in cells:
+                if time.perf_counter() >= deadline:
+                    break
+                began = time.perf_counter()
+                reply = await request(reader, writer, f"FIRE {row} {col}")
+                stats.latencies.append(time.perf_counter() - began)
+                stats.moves += 1 if len(reply) < 4 else 2
+                if reply[-1] in ("WIN", "LOSE"):
+                    stats.games += 1
+                    break
+        await request(reader, writer, "QUIT")
+    except (OSError, RuntimeError) as e:
+        stats.failed += 1
+        stats.errors.append(str(e))
+    finally:
+        stats.connected -= 1
+        writer.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+async def run(host, port, sessions, board_size, difficulty, duration, ramp, seed):
+    stats = Stats()
+    # Connections are opened at most `ramp` at a time so the listen
+    # backlog is not flooded.
+    started = asyncio.Semaphore(ramp)
+    began = time.perf_counter()
+    deadline = began + duration
+    tasks = []
+    for index in range(sessions):
+        await started.acquire()
+        rng = random.Random(f"{seed}:{index}")
+        tasks.append(asyncio.create_task(play_session(
+            host, port, board_size, difficulty, deadline, rng, stats, started
+        )))
+    await asyncio.gather(*tasks)
+    return stats, time.perf_counter() - began
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load generator for the game server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--difficulty", default="Hard")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--ramp", type=int, default=100, help="connections opening at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    stats, wall = asyncio.run(run(
+        args.host, args.port, args.sessions, args.size, args.difficulty,
+        args.duration, args.ramp, args.seed
+    ))
+    latencies = sorted(stats.latencies)
+    print(f"sessions held: {stats.peak} of {args.sessions} ({stats.failed} failed)")
+    print(f"{stats.games} games, {stats.moves} moves in {wall:.2f}s: "
+          f"{stats.moves / wall:.0f} moves/sec")
+    for error in stats.errors[:5]:
+        print(f"  error: {error}")
+    print(f"FIRE latency ms: p50 {1000 * percentile(latencies, 50):.2f}  "
+          f"p99 {1000 * percentile(latencies, 99):.2f}  "
+          f"max {1000 * (latencies[-1] if latencies else float('nan')):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Anytime Monte Carlo shot selection.
+
+Samples complete fleet layouts that agree with everything the shooter
+has seen (misses, sunk ships, hits that still need covering), counts how
+often each cell is occupied and fires at the most frequent one. Work
+stops when the time or sample budget runs out, and whatever has been
+sampled so far is used.
+
+    python -m montecarlo --size 50 --budget 1.0
+"""
+
+import argparse
+import random
+import time
+from functools import lru_cache
+
+from board import ship_mask, mask_cells
+
+TIME_BUDGET = 0.1
+PLACEMENT_TRIES = 50
+
+
+# ---------- PLACEMENT TABLES ----------
+
+@lru_cache(maxsize=None)
+def placements(board_size, ship_size):
+    """Every in-bounds placement mask of a ship on an empty board."""
+    masks = []
+    for r in range(board_size):
+        for c in range(board_size - ship_size + 1):
+            masks.append(ship_mask(board_size, r, c, ship_size, "H"))
+    if ship_size > 1:
+        for r in range(board_size - ship_size + 1):
+            for c in range(board_size):
+                masks.append(ship_mask(board_size, r, c, ship_size, "V"))
+    return masks
+
+
+@lru_cache(maxsize=None)
+def placements_through(board_size, ship_size):
+    """Placement masks grouped by the cell index they cover."""
+    by_cell = [[] for _ in range(board_size * board_size)]
+    for mask in placements(board_size, ship_size):
+        m = mask
+        while m:
+            low = m & -m
+            by_cell[low.bit_length() - 1].append(mask)
+            m ^= low
+    return by_cell
+
+
+# ---------- SAMPLING ----------
+
+def sample_layout(board_size, blocked, hits, ship_sizes, rng):
+    """
+    Draws one fleet layout that avoids `blocked` and covers every cell in
+    `hits`. Returns the occupied mask, or None if this attempt failed.
+    """
+    order = list(ship_sizes)
+    rng.shuffle(order)
+    occupied = 0
+
+    for ship_size in order:
+        need = hits & ~occupied
+        if need:
+            # Anchor the ship on a random uncovered hit.
+            cells = mask_cells(board_size, need)
+            r, c = cells[rng.randrange(len(cells))]
+            candidates = placements_through(board_size, ship_size)[r * board_size + c]
+        else:
+            candidates = placements(board_size, ship_size)
+        if not candidates:
+            return None
+
+        for _ in range(PLACEMENT_TRIES):
+            mask = candidates[rng.randrange(len(candidates))]
+            if not mask & (blocked | occupied):
+                occupied |= mask
+                break
+        else:
+            return None
+
+    if hits & ~occupied:
+        return None
+    return occupied
+
+
+def sample_frequencies(board_size, blocked, hits, ship_sizes, rng,
+                       time_budget=TIME_BUDGET, max_samples=None):
+    """
+    Accumulates cell occupancy counts until the time or sample budget
+    runs out (or the caller interrupts). Returns (counts, stats).
+    """
+    counts = [0] * (board_size * board_size)
+    attempts = accepted = 0
+    began = time.perf_counter()
+    deadline = began + time_budget if time_budget is not None else None
+
+    try:
+        while max_samples is None or accepted < max_samples:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            attempts += 1
+            layout = sample_layout(board_size, blocked, hits, ship_sizes, rng)
+            if layout is None:
+                continue
+            accepted += 1
+            while layout:
+                low = layout & -layout
+                counts[low.bit_length() - 1] += 1
+                layout ^= low
+    except KeyboardInterrupt:
+        pass  # keep what was sampled so far
+
+    seconds = time.perf_counter() - began
+    stats = {
+        "attempts": attempts,
+        "samples": accepted,
+        "seconds": seconds,
+        "samples_per_sec": accepted / seconds if seconds else 0.0,
+    }
+    return counts, stats
+
+
+# ---------- SHOT SELECTION ----------
+
+def monte_carlo_shot(board, rng=None, time_budget=TIME_BUDGET,
+                     max_samples=None, stats=None):
+    """
+    Picks the unshot cell occupied most often across sampled layouts.
+    If `stats` is a dict it is updated with the sampling statistics.
+    """
+    if rng is None:
+        rng = random
+    board_size = len(board)
+    sunk = board.fleet.sunk_mask
+    blocked = board.misses | sunk
+    hits = board.hits & ~sunk
+    shots = board.hits | board.misses
+
+    counts, run_stats = sample_frequencies(
+        board_size, blocked, hits, board.fleet.remaining_sizes(), rng,
+        time_budget, max_samples
+    )
+    if stats is not None:
+        stats.update(run_stats)
+
+    best = []
+    best_count = -1
+    for index, count in enumerate(counts):
+        if shots >> index & 1:
+            continue
+        if count > best_count:
+            best, best_count = [index], count
+        elif count == best_count:
+            best.append(index)
+
+    return divmod(best[rng.randrange(len(best))], board_size)
+
+
+# ---------- THROUGHPUT REPORT ----------
+
+def main(argv=None):
+    from game import fleet_for_size
+    from ships import place_all_ships
+    from board import create_board
+    from attacks import attack
+
+    parser = argparse.ArgumentParser(description="Monte Carlo sampler throughput")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per move")
+    parser.add_argument("--shots", type=int, default=0, help="random shots fired before sampling")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    board = create_board(args.size)
+    fleet = fleet_for_size(args.size)
+    place_all_ships(board, fleet, rng=rng)
+    for _ in range(args.shots):
+        attack(board, rng.randrange(args.size), rng.randrange(args.size))
+
+    stats = {}
+    move = monte_carlo_shot(board, rng, time_budget=args.budget, stats=stats)
+    print(f"{args.size}x{args.size}: {stats['samples']} layouts "
+          f"({stats['attempts']} attempts) in {stats['seconds']:.3f}s, "
+          f"{stats['samples_per_sec']:.0f} samples/sec, best shot {move}")
+
+
+if __name__ == "__main__":
+    main()
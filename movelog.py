@@ -0,0 +1,198 @@
+"""
+Compact binary move log and checkpointed replay.
+
+Layout (little-endian):
+
+    header   magic "BSLG", version, board size, ships per fleet
+    fleets   player ships, then computer ships: start cell, size, orientation
+    moves    one 3-byte record per shot: cell index, shooter << 2 | result kind
+
+The log is append-only: the header and fleets are written once placement
+is finished, then a record is appended after every shot. A 10x10 game is
+about 50 bytes of fleets plus 3 bytes a shot.
+"""
+
+import struct
+
+from board import create_board, ship_mask
+
+MAGIC = b"BSLG"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBHH")
+SHIP = struct.Struct("<HBB")
+MOVE = struct.Struct("<HB")
+
+PLAYER_SHOT = 0
+COMPUTER_SHOT = 1
+
+# Replay keeps a board snapshot every CHECKPOINT_EVERY moves.
+CHECKPOINT_EVERY = 8
+
+
+# ---------- WRITING ----------
+
+def encode_fleet(board):
+    """Ships of a board as SHIP records, in fleet order."""
+    size = len(board)
+    data = bytearray()
+    for cells in board.fleet.ships:
+        row, col = cells[0]
+        vertical = len(cells) > 1 and cells[1][1] == col
+        data += SHIP.pack(row * size + col, len(cells), vertical)
+    return bytes(data)
+
+
+class MoveLog:
+    """
+    Append-only game log. Bytes are kept in memory and, if a stream
+    is given, written through to it as they are produced.
+    """
+
+    def __init__(self, board_size, stream=None):
+        self.board_size = board_size
+        self.stream = stream
+        self.data = bytearray()
+        self.started = False
+        self.moves = 0
+
+    @classmethod
+    def from_bytes(cls, data, stream=None):
+        """Continues a log previously returned by getvalue()."""
+        board_size, _, _, moves = read_log(data)
+        log = cls(board_size, stream)
+        log.data += data
+        log.started = True
+        log.moves = len(moves)
+        return log
+
+    def __len__(self):
+        return self.moves
+
+    def _append(self, chunk):
+        self.data += chunk
+        if self.stream is not None:
+            self.stream.write(chunk)
+
+    def start(self, player_board, computer_board):
+        """Writes the header and both fleets; call once placement is done."""
+        if self.started:
+            raise ValueError("move log already started")
+        ships = len(player_board.fleet)
+        if len(computer_board.fleet) != ships:
+            raise ValueError("both fleets must have the same number of ships")
+        self._append(
+            HEADER.pack(MAGIC, VERSION, self.board_size, ships)
+            + encode_fleet(player_board)
+            + encode_fleet(computer_board)
+        )
+        self.started = True
+
+    def record(self, shooter, row, col, result):
+        if not self.started:
+            raise ValueError("move log not started")
+        self._append(MOVE.pack(row * self.board_size + col, shooter << 2 | result.kind))
+        self.moves += 1
+
+    def getvalue(self):
+        return bytes(self.data)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.data)
+
+
+# ---------- READING ----------
+
+def read_log(data):
+    """
+    Parses a log into (board_size, player_fleet, computer_fleet, moves).
+    Fleets are lists of (start cell, size, vertical); moves are
+    (cell index, shooter, result kind) tuples.
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("move log is truncated")
+    magic, version, board_size, ships = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a move log")
+    if version != VERSION:
+        raise ValueError(f"unsupported move log version {version}")
+
+    offset = HEADER.size
+    fleets_end = offset + 2 * ships * SHIP.size
+    if len(data) < fleets_end:
+        raise ValueError("move log is truncated")
+    fleet = list(SHIP.iter_unpack(data[offset:fleets_end]))
+
+    body = memoryview(data)[fleets_end:]
+    body = body[:len(body) - len(body) % MOVE.size]  # drop a torn last record
+    moves = [(cell, flags >> 2, flags & 3) for cell, flags in MOVE.iter_unpack(body)]
+    return board_size, fleet[:ships], fleet[ships:], moves
+
+
+def load_log(path):
+    with open(path, "rb") as f:
+        return read_log(f.read())
+
+
+def build_board(board_size, fleet):
+    board = create_board(board_size)
+    for start, ship_size, vertical in fleet:
+        row, col = divmod(start, board_size)
+        board.add_ship(ship_mask(board_size, row, col, ship_size, "V" if vertical else "H"))
+    return board
+
+
+class Replay:
+    """
+    Rebuilds both boards at any turn of a logged game. Snapshots are
+    taken every CHECKPOINT_EVERY moves as the log is replayed, so a
+    jump replays at most CHECKPOINT_EVERY - 1 moves past a snapshot.
+    """
+
+    def __init__(self, data, checkpoint_every=CHECKPOINT_EVERY):
+        self.board_size, player_fleet, computer_fleet, self.moves = read_log(data)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoints = [(
+            build_board(self.board_size, player_fleet),
+            build_board(self.board_size, computer_fleet),
+        )]
+
+    @classmethod
+    def from_file(cls, path, checkpoint_every=CHECKPOINT_EVERY):
+        with open(path, "rb") as f:
+            return cls(f.read(), checkpoint_every)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def _apply(self, boards, turn):
+        cell, shooter, kind = self.moves[turn]
+        target = boards[1] if shooter == PLAYER_SHOT else boards[0]
+        row, col = divmod(cell, self.board_size)
+        result = target.attack(row, col)
+        if result.kind != kind:
+            raise ValueError(f"move {turn} does not match the logged fleets")
+
+    def boards_at(self, turn):
+        """
+        (player_board, computer_board) after the first `turn` moves.
+        The returned boards are copies and safe to modify.
+        """
+        if not 0 <= turn <= len(self.moves):
+            raise IndexError("turn out of range")
+
+        every = self.checkpoint_every
+        # Extend the checkpoint list up to the one just before `turn`.
+        while (len(self.checkpoints) - 1) * every + every <= turn:
+            start = (len(self.checkpoints) - 1) * every
+            boards = tuple(b.copy() for b in self.checkpoints[-1])
+            for i in range(start, start + every):
+                self._apply(boards, i)
+            self.checkpoints.append(boards)
+
+        index = turn // every
+        boards = tuple(b.copy() for b in self.checkpoints[index])
+        for i in range(index * every, turn):
+            self._apply(boards, i)
+        return boards
@@ -0,0 +1,146 @@
+"""
+Opening books: precomputed first shots per (board size, fleet).
+
+A book is a complete binary tree of shots in heap order. Node 0 is the
+first shot; after the shot at node i the AI moves to node 2i + 1 on a
+miss and 2i + 2 on a hit. Each shot is the best cell of the Expert
+density heatmap for the observations along that path, so early moves
+become table lookups.
+
+    python -m openings --sizes 5 7 10 --depth 10
+
+Books are stored in books/ as a small header followed by one 16-bit
+cell index per node. Building needs NumPy; loading does not.
+"""
+
+import os
+import struct
+from functools import lru_cache
+
+MAGIC = b"BSBK"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBHB")
+
+BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "books")
+DEPTH = 10
+
+# Books kept in memory at once; one per board size and fleet in play.
+BOOK_CACHE_SIZE = 8
+
+
+def book_key(ship_sizes):
+    return tuple(sorted(ship_sizes, reverse=True))
+
+
+def book_path(board_size, ship_sizes, book_dir=BOOK_DIR):
+    fleet = "-".join(str(s) for s in book_key(ship_sizes))
+    return os.path.join(book_dir, f"{board_size}x{board_size}_{fleet}.book")
+
+
+# ---------- LOADING ----------
+
+def decode_book(data):
+    """(board_size, depth, cells) from book bytes; cells in heap order."""
+    magic, version, board_size, depth = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not an opening book")
+    if version != VERSION:
+        raise ValueError(f"unsupported opening book version {version}")
+    nodes = (1 << depth) - 1
+    indices = struct.unpack_from(f"<{nodes}H", data, HEADER.size)
+    return board_size, depth, tuple(divmod(i, board_size) for i in indices)
+
+
+@lru_cache(maxsize=BOOK_CACHE_SIZE)
+def _load_book(board_size, key):
+    try:
+        with open(book_path(board_size, key), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    size, _, cells = decode_book(data)
+    if size != board_size:
+        raise ValueError(f"opening book for {size}x{size} filed as {board_size}x{board_size}")
+    return cells
+
+
+def load_book(board_size, ship_sizes):
+    """Shots of the book for this board and fleet, or None if there is none."""
+    return _load_book(board_size, book_key(ship_sizes))
+
+
+# ---------- BUILDING ----------
+
+def build_book(board_size, ship_sizes, depth=DEPTH):
+    """
+    Best shot for every miss/hit history up to `depth` shots.
+    Histories are assumed to sink nothing; the AI leaves the book
+    as soon as a ship goes down.
+    """
+    import numpy as np
+    from heatmap import density_heatmap
+
+    ship_sizes = list(book_key(ship_sizes))
+    blocked = np.zeros((board_size, board_size), dtype=np.uint8)
+    hits = np.zeros((board_size, board_size), dtype=np.uint8)
+    shot = np.zeros(board_size * board_size, dtype=bool)
+    cells = [0] * ((1 << depth) - 1)
+
+    def visit(node):
+        heat = density_heatmap(board_size, blocked, hits, ship_sizes).ravel()
+        heat = np.where(shot, -1, heat)
+        cell = int(np.argmax(heat))
+        cells[node] = cell
+
+        child = 2 * node + 1
+        if child >= len(cells):
+            return
+        r, c = divmod(cell, board_size)
+        shot[cell] = True
+        for outcome, grid in enumerate((blocked, hits)):
+            grid[r, c] = 1
+            visit(child + outcome)
+            grid[r, c] = 0
+        shot[cell] = False
+
+    visit(0)
+    return cells
+
+
+def encode_book(board_size, depth, cells):
+    return HEADER.pack(MAGIC, VERSION, board_size, depth) + struct.pack(
+        f"<{len(cells)}H", *cells
+    )
+
+
+def write_book(board_size, ship_sizes, depth=DEPTH, book_dir=BOOK_DIR):
+    cells = build_book(board_size, ship_sizes, depth)
+    os.makedirs(book_dir, exist_ok=True)
+    path = book_path(board_size, ship_sizes, book_dir)
+    with open(path, "wb") as f:
+        f.write(encode_book(board_size, depth, cells))
+    return path
+
+
+def main(argv=None):
+    # Imported here: the loader above is on the game's startup path.
+    import argparse
+    import time
+    from game import SHIP_CONFIGS, fleet_for_size
+
+    parser = argparse.ArgumentParser(description="Build opening books for the AI")
+    parser.add_argument("--sizes", type=int, nargs="+", default=sorted(SHIP_CONFIGS))
+    parser.add_argument("--depth", type=int, default=DEPTH)
+    parser.add_argument("--out", default=BOOK_DIR)
+    args = parser.parse_args(argv)
+
+    for board_size in args.sizes:
+        began = time.perf_counter()
+        path = write_book(board_size, fleet_for_size(board_size), args.depth, args.out)
+        print(f"{path}: {(1 << args.depth) - 1} nodes, "
+              f"{os.path.getsize(path)} bytes in {time.perf_counter() - began:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Devious fleet placement: layouts the bundled AIs take longest to sink.
+
+Two stages, both inside a time budget:
+
+1. Screening. Many random candidate layouts are drawn in one batch
+   (layouts.batch_layouts) and ranked in a few array operations by how
+   late a density-first hunter reaches their ships: every cell gets its
+   rank in the empty-board heatmap order, and a layout scores the sum
+   over its ships of the best-ranked cell.
+2. Simulation. The best-screened finalists are played out by the
+   scoring strategies, round after round, until the budget runs out.
+   Every finalist faces the same shooter random streams in a round, so
+   the comparison is not swamped by shooter luck. The finalist with
+   the highest mean shots-to-win is kept.
+
+Boards above SIMULATION_MAX_BOARD only get the screening (one AI game
+there can outlast the budget), and boards above MAX_BOARD, whose big
+fleets make even screening slow, are placed at random. Without NumPy
+the screening is skipped and random finalists are simulated directly.
+
+    python -m placement --size 10 --budget 2 --evaluate 200
+"""
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ai import HAVE_NUMPY
+from board import create_board
+from ships import random_layout
+from strategies import create_strategy, play_out, strategy_names
+
+BUDGET = 1.0
+FINALISTS = 16
+
+# Cells screened in one batch: 4000 candidates on a 10x10 board, fewer
+# on bigger boards so screening stays a small part of the budget.
+SCREEN_CELLS = 400000
+SIMULATION_MAX_BOARD = 12
+MAX_BOARD = 40
+
+# Cheap strategies to simulate against; the ones that are registered are used.
+SCORING_STRATEGIES = ("Hard", "Expert")
+
+
+def build_board(board_size, layout):
+    board = create_board(board_size)
+    for mask in layout:
+        board.add_ship(mask)
+    return board
+
+
+def scoring_strategies(names=None):
+    available = strategy_names()
+    return [name for name in (names or SCORING_STRATEGIES) if name in available]
+
+
+# ---------- SCREENING ----------
+
+def screen_layouts(board_size, ship_sizes, count, keep, rng):
+    """
+    Draws `count` layouts and returns the `keep` best screened ones as
+    lists of ship masks, best first.
+    """
+    import numpy as np
+    from heatmap import density_heatmap
+    from layouts import batch_layouts
+
+    ids = batch_layouts(board_size, ship_sizes, count, rng=rng.getrandbits(64))
+
+    empty = np.zeros((board_size, board_size), dtype=np.uint8)
+    heat = density_heatmap(board_size, empty, empty, list(ship_sizes)).ravel()
+    # Rank of each cell in the order a density hunter would fire at them.
+    rank = np.empty(heat.size, dtype=np.int32)
+    rank[np.argsort(-heat, kind="stable")] = np.arange(heat.size)
+    rank = rank.reshape(board_size, board_size)
+
+    score = np.zeros(len(ids), dtype=np.int64)
+    for ship_id in range(1, len(ship_sizes) + 1):
+        score += np.where(ids == ship_id, rank, heat.size).min(axis=(1, 2))
+    best = np.argsort(-score, kind="stable")[:keep]
+
+    weights = [1 << i for i in range(board_size * board_size)]
+    layouts = []
+    for k in best:
+        flat = ids[k].ravel()
+        layouts.append([
+            sum(weights[i] for i in np.flatnonzero(flat == ship_id).tolist())
+            for ship_id in range(1, len(ship_sizes) + 1)
+        ])
+    return layouts
+
+
+# ---------- SIMULATION ----------
+
+def score_layouts(board_size, ship_sizes, layouts, names, budget, seed):
+    """
+    Plays `names` against the layouts in rounds until `budget` seconds
+    pass. The clock is checked after each layout, so the first layout is
+    always played and later ones may not be. Returns per layout
+    {name: [total shots, games]}.
+    """
+    deadline = time.perf_counter() + budget
+    totals = [{name: [0, 0] for name in names} for _ in layouts]
+    round_index = 0
+    while True:
+        for layout, total in zip(layouts, totals):
+            for name in names:
+                rng = random.Random(f"{seed}:{round_index}:{name}")
+                strategy = create_strategy(name, board_size, ship_sizes, rng)
+                total[name][0] += play_out(strategy, build_board(board_size, layout))
+                total[name][1] += 1
+            if time.perf_counter() >= deadline:
+                return totals
+        round_index += 1
+
+
+def mean_shots(total):
+    """Mean over strategies of each one's mean shots-to-win, or None if unplayed."""
+    if not total or any(games == 0 for _, games in total.values()):
+        return None
+    return sum(shots / games for shots, games in total.values()) / len(total)
+
+
+def default_candidates(board_size):
+    return max(FINALISTS, SCREEN_CELLS // (board_size * board_size))
+
+
+def devious_layout(board_size, ship_sizes, rng=None, budget=BUDGET,
+                   candidates=None, finalists=FINALISTS, strategies=None,
+                   workers=1, stats=None):
+    """
+    Ship masks (in fleet order) of the hardest layout found within
+    `budget` seconds. `stats`, if given, is filled with what was done.
+    """
+    if rng is None:
+        rng = random
+    if board_size > MAX_BOARD:
+        if stats is not None:
+            stats.update({"candidates": 1, "finalists": 1, "games": 0,
+                          "strategies": [], "mean_shots": None, "seconds": 0.0})
+        return random_layout(board_size, ship_sizes, rng)
+    if candidates is None:
+        candidates = default_candidates(board_size)
+    began = time.perf_counter()
+    names = scoring_strategies(strategies)
+
+    if HAVE_NUMPY:
+        layouts = screen_layouts(board_size, ship_sizes, candidates, finalists, rng)
+        if board_size > SIMULATION_MAX_BOARD:
+            names = []
+    else:
+        layouts = [random_layout(board_size, ship_sizes, rng) for _ in range(finalists)]
+        candidates = finalists
+
+    seed = rng.getrandbits(64)
+    remaining = max(0.0, budget - (time.perf_counter() - began))
+    if not names:
+        totals = [{} for _ in layouts]
+    elif workers == 1 or len(layouts) < 2:
+        totals = score_layouts(board_size, ship_sizes, layouts, names, remaining, seed)
+    else:
+        # Each worker scores a slice of the finalists with the same shooter streams.
+        step = -(-len(layouts) // workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(score_layouts, board_size, ship_sizes,
+                            layouts[i:i + step], names, remaining, seed)
+                for i in range(0, len(layouts), step)
+            ]
+            totals = [total for f in futures for total in f.result()]
+
+    # Unplayed finalists score -1; with no games at all the best-screened one wins.
+    scores = [mean_shots(total) for total in totals]
+    best = max(range(len(layouts)), key=lambda i: -1 if scores[i] is None else scores[i])
+
+    if stats is not None:
+        stats.update({
+            "candidates": candidates,
+            "finalists": len(layouts),
+            "games": sum(games for total in totals for _, games in total.values()),
+            "strategies": names,
+            "mean_shots": scores[best],
+            "seconds": time.perf_counter() - began,
+        })
+    return layouts[best]
+
+
+# ---------- COMMAND LINE ----------
+
+def evaluate(board_size, ship_sizes, layouts, names, seed):
+    """Mean shots-to-win per strategy, one game per layout, fresh shooter streams."""
+    means = {}
+    for name in names:
+        total = 0
+        for i, layout in enumerate(layouts):
+            rng = random.Random(f"evaluate:{seed}:{i}:{name}")
+            strategy = create_strategy(name, board_size, ship_sizes, rng)
+            total += play_out(strategy, build_board(board_size, layout))
+        means[name] = total / len(layouts)
+    return means
+
+
+def main(argv=None):
+    from game import fleet_for_size
+
+    parser = argparse.ArgumentParser(description="Find fleet layouts the AI struggles with")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=BUDGET, help="seconds")
+    parser.add_argument("--candidates", type=int)
+    parser.add_argument("--finalists", type=int, default=FINALISTS)
+    parser.add_argument("--strategies", nargs="+", default=list(SCORING_STRATEGIES))
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--evaluate", type=int, default=0, metavar="GAMES",
+                        help="compare the result against random layouts")
+    args = parser.parse_args(argv)
+
+    fleet = fleet_for_size(args.size)
+    rng = random.Random(args.seed)
+    stats = {}
+    layout = devious_layout(
+        args.size, fleet, rng, args.budget, args.candidates, args.finalists,
+        args.strategies, args.workers, stats
+    )
+    print(f"{stats['candidates']} candidates, {stats['finalists']} finalists, "
+          f"{stats['games']} games in {stats['seconds']:.2f}s")
+    if stats["mean_shots"] is not None:
+        print(f"mean shots-to-win in simulation: {stats['mean_shots']:.2f}")
+    board = build_board(args.size, layout)
+    for r in range(args.size):
+        print(" ".join(board.cell(r, c) for c in range(args.size)))
+
+    if args.evaluate:
+        # The same shooter streams against the chosen layout and fresh random ones.
+        names = stats["strategies"]
+        devious = evaluate(args.size, fleet, [layout] * args.evaluate, names, args.seed)
+        plain = evaluate(args.size, fleet,
+                         [random_layout(args.size, fleet, rng) for _ in range(args.evaluate)],
+                         names, args.seed)
+        print(f"mean shots-to-win over {args.evaluate} games")
+        for name in names:
+            print(f"{name:<12} devious {devious[name]:6.2f}   random {plain[name]:6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Opt-in timing of the stages of a turn.
+
+Set BATTLESHIP_PROFILE=1 (or pass --profile to the GUI or simulate) to
+record a span for every attack, sunk-ship scan, AI move (by kind), board
+repaint, counter update and animation wait. Spans go to a ring buffer
+of the last BUFFER_SIZE entries; summary() gives percentiles per stage
+and export_chrome_trace() writes trace-event JSON for chrome://tracing
+or Perfetto. BATTLESHIP_PROFILE_TRACE names the file written at game end.
+
+When disabled, the hot paths only pay for a check of ENABLED.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+BUFFER_SIZE = 100000
+
+ENABLED = bool(os.environ.get("BATTLESHIP_PROFILE"))
+TRACE_PATH = os.environ.get("BATTLESHIP_PROFILE_TRACE") or "battleship_trace.json"
+
+now = time.perf_counter_ns
+
+# (stage, start ns, duration ns, thread id)
+_spans = deque(maxlen=BUFFER_SIZE)
+
+
+def enable(trace_path=None, buffer_size=BUFFER_SIZE):
+    global ENABLED, TRACE_PATH, _spans
+    ENABLED = True
+    if trace_path:
+        TRACE_PATH = trace_path
+    if buffer_size != _spans.maxlen:
+        _spans = deque(_spans, maxlen=buffer_size)
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def clear():
+    _spans.clear()
+
+
+# ---------- RECORDING ----------
+
+def record(stage, began, ended=None):
+    """
+    Adds a span that started at `began` (a now() value) and returns its
+    end, so consecutive stages can be timed as laps.
+    """
+    if ended is None:
+        ended = now()
+    _spans.append((stage, began, ended - began, threading.get_ident()))
+    return ended
+
+
+class Span:
+    """Context manager timing a block; does nothing while disabled."""
+
+    __slots__ = ("stage", "began")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.began = None
+
+    def __enter__(self):
+        if ENABLED:
+            self.began = now()
+        return self
+
+    def __exit__(self, *exc):
+        if self.began is not None:
+            record(self.stage, self.began)
+        return False
+
+
+def span(stage):
+    return Span(stage)
+
+
+def spans():
+    return list(_spans)
+
+
+# ---------- REPORTING ----------
+
+def _percentile(sorted_values, pct):
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summary():
+    """Per-stage count, total and mean / p50 / p90 / p99 / max in milliseconds."""
+    by_stage = {}
+    for stage, _, duration, _ in _spans:
+        by_stage.setdefault(stage, []).append(duration / 1e6)
+
+    stats = {}
+    for stage, durations in sorted(by_stage.items()):
+        durations.sort()
+        stats[stage] = {
+            "count": len(durations),
+            "total_ms": sum(durations),
+            "mean_ms": sum(durations) / len(durations),
+            "p50_ms": _percentile(durations, 50),
+            "p90_ms": _percentile(durations, 90),
+            "p99_ms": _percentile(durations, 99),
+            "max_ms": durations[-1],
+        }
+    return stats
+
+
+def print_summary():
+    stats = summary()
+    if not stats:
+        return
+    print(f"{'stage':<24} {'count':>7} {'total ms':>10} {'mean':>8} "
+          f"{'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for stage, s in stats.items():
+        print(f"{stage:<24} {s['count']:>7} {s['total_ms']:>10.2f} {s['mean_ms']:>8.3f} "
+              f"{s['p50_ms']:>8.3f} {s['p90_ms']:>8.3f} {s['p99_ms']:>8.3f} {s['max_ms']:>8.3f}")
+
+
+def chrome_trace():
+    pid = os.getpid()
+    return {
+        "traceEvents": [
+            {
+                "name": stage,
+                "cat": stage.split(".")[0],
+                "ph": "X",
+                "ts": began / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            for stage, began, duration, tid in _spans
+        ],
+        "displayTimeUnit": "ms",
+    }
+
+
+def export_chrome_trace(path=None):
+    path = path or TRACE_PATH
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+    return path
+
+
+def report(path=None):
+    """Prints the summary and writes the trace; called at game end."""
+    if not ENABLED or not _spans:
+        return
+    print_summary()
+    print(f"trace written to {export_chrome_trace(path)}")
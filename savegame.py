@@ -0,0 +1,230 @@
+"""
+Compact binary snapshots of a GameSession.
+
+A snapshot holds everything needed to carry on exactly where the game
+stopped: both boards (shot bitmaps and fleets), placement progress,
+turn and winner, the AI's candidate pools in their current order, the
+random generator state and the move log. Sunk ships and hit points are
+rebuilt from the shot bitmaps on load.
+
+The first byte after the magic is the format version. Readers ignore
+trailing bytes, so later versions can append sections without breaking
+older snapshots; the version only changes for incompatible layouts.
+Monte Carlo budget overrides in ai_state are not saved; the opening
+book and Perfect's policy are looked up again by board size and fleet.
+"""
+
+import os
+import random
+import struct
+
+from ai import CellPool, TargetQueue
+from openings import load_book
+from solver import load_policy
+from board import create_board, ship_mask, popcount
+from game import GameSession, PLAYER, COMPUTER
+from movelog import MoveLog, SHIP, encode_fleet
+
+MAGIC = b"BSSV"
+VERSION = 1
+
+SAVE_PATH = os.path.join(os.path.expanduser("~"), ".battleship_save")
+
+HEADER = struct.Struct("<4sBHBBH")
+COUNT = struct.Struct("<H")
+BOOK_NODE = struct.Struct("<i")
+POLICY_NODE = struct.Struct("<i")
+LENGTH = struct.Struct("<I")
+GAUSS = struct.Struct("<Bd")
+
+PLACEMENT_FLAG = 1
+COMPUTER_TURN_FLAG = 2
+TARGET_MODE_FLAG = 4
+
+WINNERS = (None, PLAYER, COMPUTER)
+
+
+# ---------- WRITING ----------
+
+def _pack_bytes(data):
+    return LENGTH.pack(len(data)) + data
+
+
+def _pack_cells(cells, board_size):
+    indices = [r * board_size + c for r, c in cells]
+    return LENGTH.pack(len(indices)) + struct.pack(f"<{len(indices)}H", *indices)
+
+
+def _pack_board(board):
+    width = (board.size * board.size + 7) // 8
+    return (
+        board.hits.to_bytes(width, "little")
+        + board.misses.to_bytes(width, "little")
+        + COUNT.pack(len(board.fleet))
+        + encode_fleet(board)
+    )
+
+
+def _pack_rng(rng):
+    version, internal, gauss = rng.getstate()
+    return (
+        struct.pack(f"<BH{len(internal)}I", version, len(internal), *internal)
+        + GAUSS.pack(gauss is not None, gauss or 0.0)
+    )
+
+
+def dump_session(session):
+    """Serializes a session to bytes."""
+    n = session.board_size
+    ai_state = session.ai_state
+
+    flags = 0
+    if session.placement_phase:
+        flags |= PLACEMENT_FLAG
+    if session.turn == COMPUTER:
+        flags |= COMPUTER_TURN_FLAG
+    if ai_state["mode"] == "target":
+        flags |= TARGET_MODE_FLAG
+
+    return b"".join((
+        HEADER.pack(
+            MAGIC, VERSION, n, flags,
+            WINNERS.index(session.winner), session.current_ship_index
+        ),
+        _pack_bytes(bytes(session.ship_sizes)),
+        _pack_bytes(session.difficulty.encode()),
+        _pack_board(session.player_board),
+        _pack_board(session.computer_board),
+        _pack_cells(ai_state["open_cells"], n),
+        _pack_cells(ai_state["hunt_cells"], n),
+        _pack_cells(ai_state["targets"], n),
+        _pack_rng(session.rng),
+        _pack_bytes(session.log.getvalue()),
+        BOOK_NODE.pack(ai_state.get("book_node", -1)),
+        POLICY_NODE.pack(ai_state.get("policy_node", -1)),
+    ))
+
+
+def save_game(session, path=SAVE_PATH):
+    # Write then rename so a crash mid-save keeps the previous snapshot.
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(dump_session(session))
+    os.replace(temp, path)
+
+
+# ---------- READING ----------
+
+class _Reader:
+    __slots__ = ("data", "offset")
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        if isinstance(fmt, str):
+            fmt = struct.Struct(fmt)
+        if self.offset + fmt.size > len(self.data):
+            raise ValueError("saved game is truncated")
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def take(self, length):
+        if self.offset + length > len(self.data):
+            raise ValueError("saved game is truncated")
+        chunk = bytes(self.data[self.offset:self.offset + length])
+        self.offset += length
+        return chunk
+
+    def at_end(self):
+        return self.offset >= len(self.data)
+
+    def blob(self):
+        return self.take(self.unpack(LENGTH)[0])
+
+    def cells(self, board_size):
+        count = self.unpack(LENGTH)[0]
+        return [divmod(i, board_size) for i in self.unpack(f"<{count}H")]
+
+
+def _read_board(reader, board_size):
+    width = (board_size * board_size + 7) // 8
+    board = create_board(board_size)
+    board.hits = int.from_bytes(reader.take(width), "little")
+    board.misses = int.from_bytes(reader.take(width), "little")
+
+    fleet = board.fleet
+    for _ in range(reader.unpack(COUNT)[0]):
+        start, ship_size, vertical = reader.unpack(SHIP)
+        row, col = divmod(start, board_size)
+        mask = ship_mask(board_size, row, col, ship_size, "V" if vertical else "H")
+        ship_id = board.add_ship(mask)
+
+        # Hit points and sunk state follow from the hit bitmap.
+        hp = ship_size - popcount(board.hits & mask)
+        fleet.hp[ship_id] = hp
+        if not hp:
+            fleet.sunk.add(ship_id)
+            fleet.sunk_mask |= mask
+            fleet.sunk_cells.update(fleet.ships[ship_id])
+    return board
+
+
+def _read_rng(reader):
+    version, length = reader.unpack("<BH")
+    internal = reader.unpack(f"<{length}I")
+    has_gauss, gauss = reader.unpack(GAUSS)
+    rng = random.Random()
+    rng.setstate((version, internal, gauss if has_gauss else None))
+    return rng
+
+
+def load_session(data):
+    """Rebuilds a GameSession from dump_session output."""
+    reader = _Reader(data)
+    magic, version, n, flags, winner, ship_index = reader.unpack(HEADER)
+    if magic != MAGIC:
+        raise ValueError("not a saved Battleship game")
+    if version != VERSION:
+        raise ValueError(f"unsupported saved game version {version}")
+
+    # Bypass __init__: it would place a fresh computer fleet.
+    session = GameSession.__new__(GameSession)
+    session.board_size = n
+    session.ship_sizes = list(reader.blob())
+    session.difficulty = reader.blob().decode()
+    session.player_board = _read_board(reader, n)
+    session.computer_board = _read_board(reader, n)
+    session.current_ship_index = ship_index
+    session.placement_phase = bool(flags & PLACEMENT_FLAG)
+    session.turn = COMPUTER if flags & COMPUTER_TURN_FLAG else PLAYER
+    session.winner = WINNERS[winner]
+
+    session.ai_state = {
+        "mode": "target" if flags & TARGET_MODE_FLAG else "hunt",
+        "open_cells": CellPool(reader.cells(n)),
+        "hunt_cells": CellPool(reader.cells(n)),
+        "targets": TargetQueue(reader.cells(n)),
+    }
+    session.rng = _read_rng(reader)
+
+    log_data = reader.blob()
+    session.log = MoveLog.from_bytes(log_data) if log_data else MoveLog(n)
+
+    book = load_book(n, session.ship_sizes)
+    book_node = -1 if reader.at_end() else reader.unpack(BOOK_NODE)[0]
+    session.ai_state["book"] = book
+    session.ai_state["book_node"] = book_node if book else -1
+
+    policy = load_policy(n, session.ship_sizes)
+    policy_node = -1 if reader.at_end() else reader.unpack(POLICY_NODE)[0]
+    session.ai_state["policy"] = policy
+    session.ai_state["policy_node"] = policy_node if policy else -1
+    return session
+
+
+def load_game(path=SAVE_PATH):
+    with open(path, "rb") as f:
+        return load_session(f.read())
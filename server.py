@@ -0,0 +1,253 @@
+"""
+Asyncio TCP server hosting independent player-vs-AI games.
+
+Every connection owns one GameSession. The protocol is line based:
+each request is one line of space-separated words, and each gets
+exactly one reply line starting with OK or ERR.
+
+    NEW <size> [difficulty]   start a game     OK <size> <ship sizes, comma separated>
+    PLACE <row> <col> <H|V>   place next ship  OK <ships left to place>
+    AUTO                      place the rest   OK 0
+    START                     begin the battle OK
+    FIRE <row> <col>          shoot            OK <result> [<ai row> <ai col> <ai result>] [WIN|LOSE]
+    STATE                     board snapshot   OK <phase> <winner|-> <target board> <own board>
+    STATS                     server counters  OK sessions=<n> games=<n> moves=<n>
+    QUIT                      close            OK
+
+Results are miss, hit or sunk. FIRE returns the computer's reply in the
+same line, so a turn is one round trip. STATE boards are size*size
+characters, row by row, using ~ S X O (the target board hides ships).
+
+Cheap difficulties are answered on the event loop. Expert and Monte
+Carlo moves are computed on a thread pool from a copy of the board, so
+a slow move only delays its own connection.
+
+    python -m server --port 8765 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from ai import DIFFICULTIES, SLOW_DIFFICULTIES
+from board import MISS, HIT, SUNK
+from game import GameSession, MIN_BOARD_SIZE, MAX_BOARD_SIZE, fleet_for_size
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+# Longest request line accepted; requests are a few words.
+LINE_LIMIT = 256
+
+RESULT_NAMES = {MISS: "miss", HIT: "hit", SUNK: "sunk"}
+
+
+class ProtocolError(Exception):
+    """A request that gets an ERR reply; the connection stays open."""
+
+
+def board_view(board, hide_ships=False):
+    size = len(board)
+    view = "".join(board.cell(r, c) for r in range(size) for c in range(size))
+    return view.replace("S", "~") if hide_ships else view
+
+
+def _parse_cell(session, words):
+    try:
+        row, col = int(words[0]), int(words[1])
+    except (IndexError, ValueError):
+        raise ProtocolError("expected <row> <col>")
+    if not (0 <= row < session.board_size and 0 <= col < session.board_size):
+        raise ProtocolError("cell off the board")
+    return row, col
+
+
+class GameServer:
+    """
+    Accepts connections and runs one game per connection.
+    Counters are only touched from the event loop.
+    """
+
+    def __init__(self, executor, seed=None):
+        self.executor = executor
+        self.seed = seed
+        self.connections = 0
+        self.sessions = 0
+        self.games = 0
+        self.moves = 0
+
+    def new_rng(self):
+        # Seeded servers give every game its own reproducible stream.
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}:{self.games}")
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        state = {"session": None}
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than LINE_LIMIT
+                    writer.write(b"ERR line too long\n")
+                    break
+                if not line:
+                    break
+                words = line.decode("ascii", "replace").split()
+                if not words:
+                    continue
+                command = words[0].upper()
+                try:
+                    reply = await self.dispatch(state, command, words[1:])
+                except ProtocolError as e:
+                    reply = f"ERR {e}"
+                writer.write(reply.encode("ascii") + b"\n")
+                await writer.drain()
+                if command == "QUIT":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            if state["session"] is not None:
+                self.sessions -= 1
+            self.connections -= 1
+            writer.close()
+
+    async def dispatch(self, state, command, args):
+        if command == "NEW":
+            return self.new_game(state, args)
+        if command == "STATS":
+            return f"OK sessions={self.sessions} games={self.games} moves={self.moves}"
+        if command == "QUIT":
+            return "OK"
+
+        session = state["session"]
+        if session is None:
+            if command in ("PLACE", "AUTO", "START", "FIRE", "STATE"):
+                raise ProtocolError("no game; send NEW first")
+            raise ProtocolError(f"unknown command {command}")
+
+        if command == "PLACE":
+            return self.place(session, args)
+        if command == "AUTO":
+            if not session.placement_phase:
+                raise ProtocolError("placement is over")
+            session.auto_place_player()
+            return "OK 0"
+        if command == "START":
+            if not session.placement_phase:
+                raise ProtocolError("battle already started")
+            if not session.all_ships_placed:
+                raise ProtocolError("not all ships have been placed")
+            session.finish_placement()
+            return "OK"
+        if command == "FIRE":
+            return await self.fire(session, args)
+        if command == "STATE":
+            return self.state(session)
+        raise ProtocolError(f"unknown command {command}")
+
+    # ================= COMMANDS =================
+
+    def new_game(self, state, args):
+        try:
+            board_size = int(args[0])
+        except (IndexError, ValueError):
+            raise ProtocolError("expected NEW <size> [difficulty]")
+        if not MIN_BOARD_SIZE <= board_size <= MAX_BOARD_SIZE:
+            raise ProtocolError(f"size must be {MIN_BOARD_SIZE}-{MAX_BOARD_SIZE}")
+        difficulty = " ".join(args[1:]) or "Hard"
+        if difficulty not in DIFFICULTIES:
+            raise ProtocolError(f"unknown difficulty {difficulty}")
+
+        ship_sizes = fleet_for_size(board_size)
+        if state["session"] is None:
+            self.sessions += 1
+        state["session"] = GameSession(board_size, ship_sizes, difficulty, rng=self.new_rng())
+        self.games += 1
+        return f"OK {board_size} {','.join(map(str, ship_sizes))}"
+
+    def place(self, session, args):
+        row, col = _parse_cell(session, args)
+        orientation = args[2].upper() if len(args) > 2 else ""
+        if orientation not in ("H", "V"):
+            raise ProtocolError("orientation must be H or V")
+        if session.place_player_ship(row, col, orientation) is None:
+            raise ProtocolError("ship does not fit there")
+        return f"OK {len(session.ship_sizes) - session.current_ship_index}"
+
+    async def fire(self, session, args):
+        row, col = _parse_cell(session, args)
+        result = session.player_move(row, col)
+        if result is None:
+            raise ProtocolError("cannot fire there now")
+        self.moves += 1
+        reply = f"OK {RESULT_NAMES[result.kind]}"
+        if session.is_over:
+            return reply + " WIN"
+
+        if session.difficulty in SLOW_DIFFICULTIES:
+            loop = asyncio.get_running_loop()
+            board = session.player_board.copy()
+            move = await loop.run_in_executor(self.executor, session.choose_ai_move, board)
+        else:
+            move = session.choose_ai_move()
+        result = session.play_ai_move(move)
+        if move is not None:
+            self.moves += 1
+            reply += f" {move[0]} {move[1]} {RESULT_NAMES[result.kind]}"
+        if session.is_over:
+            reply += " LOSE"
+        return reply
+
+    def state(self, session):
+        if session.placement_phase:
+            phase = "placement"
+        elif session.is_over:
+            phase = "over"
+        else:
+            phase = "battle"
+        return " ".join((
+            "OK", phase, session.winner or "-",
+            board_view(session.computer_board, hide_ships=True),
+            board_view(session.player_board),
+        ))
+
+
+# ================= RUNNING =================
+
+async def serve(host=HOST, port=PORT, workers=None, seed=None, ready=None):
+    """Runs the server until cancelled; `ready` is set once it listens."""
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ai") as executor:
+        game_server = GameServer(executor, seed)
+        server = await asyncio.start_server(
+            game_server.handle, host, port, limit=LINE_LIMIT, backlog=1024
+        )
+        for sock in server.sockets:
+            print(f"serving on {sock.getsockname()[0]}:{sock.getsockname()[1]}")
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Battleship game server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="threads computing Expert and Monte Carlo moves")
+    parser.add_argument("--seed", type=int, help="make every game reproducible")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
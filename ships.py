@@ -1,4 +1,16 @@
 import random
+from functools import lru_cache
+
+from board import ship_mask, popcount
+
+# Attempts at a whole fleet before giving up on a crowded board.
+FLEET_RETRIES = 100
+
+# Share of cells covered by ships in an auto-generated fleet
+# (17 of 100 on the classic board).
+FLEET_DENSITY = 0.17
+FLEET_PATTERN = [5, 4, 3, 3, 2]
+
 
 def can_place_ship(board, row, col, ship_size, orientation):
     size = len(board)
@@ -6,47 +18,201 @@ def can_place_ship(board, row, col, ship_size, orientation):
     if orientation == "H":
         if col + ship_size > size:
             return False
-        for i in range(ship_size):
-            if board[row][col + i] != "~":
-                return False
-    else: 
+    else:
         if row + ship_size > size:
             return False
-        for i in range(ship_size):
-            if board[row + i][col] != "~":
-                return False
 
-    return True
+    return not board.used & ship_mask(size, row, col, ship_size, orientation)
 
 
-def place_ship(board, ship_size):
-    size = len(board)
+def ship_cells(row, col, ship_size, orientation):
+    if orientation == "H":
+        return [(row, col + i) for i in range(ship_size)]
+    return [(row + i, col) for i in range(ship_size)]
+
+
+def place_ship_at(board, row, col, ship_size, orientation):
+    """
+    Places a ship and registers it in the board's fleet.
+    Returns the list of cells the ship covers.
+    """
+    ship_id = board.add_ship(
+        ship_mask(len(board), row, col, ship_size, orientation)
+    )
+    return board.fleet.ships[ship_id]
+
+
+# ---------- PLACEMENT INDEX ----------
+
+@lru_cache(maxsize=None)
+def _row_starts(size, ship_size):
+    """Cells whose column leaves room for a horizontal ship."""
+    row = (1 << (size - ship_size + 1)) - 1
+    mask = 0
+    for r in range(size):
+        mask |= row << (r * size)
+    return mask
+
+
+def placement_starts(size, used, ship_size):
+    """
+    Start-cell masks (horizontal, vertical) of every legal placement.
+    A start bit survives the shifted ANDs only if a run of at least
+    ship_size free cells begins there along that row or column.
+    """
+    if ship_size > size:
+        return 0, 0
+    free = ~used & ((1 << (size * size)) - 1)
+    horizontal = free & _row_starts(size, ship_size)
+    vertical = free
+    for i in range(1, ship_size):
+        horizontal &= free >> i
+        vertical &= free >> (i * size)
+    if ship_size == 1:
+        vertical = 0  # a single cell would otherwise be counted twice
+    return horizontal, vertical
+
+
+def count_placements(size, used, ship_size):
+    horizontal, vertical = placement_starts(size, used, ship_size)
+    return popcount(horizontal) + popcount(vertical)
+
 
-    while True:
-        orientation = random.choice(["H", "V"])
-        row = random.randint(0, size - 1)
-        col = random.randint(0, size - 1)
+def _nth_set_bit(mask, n):
+    shift = 0
+    width = mask.bit_length()
+    while width > 64:
+        half = width // 2
+        low = mask & ((1 << half) - 1)
+        count = popcount(low)
+        if n < count:
+            mask = low
+            width = half
+        else:
+            n -= count
+            mask >>= half
+            shift += half
+            width -= half
+    while n:
+        mask &= mask - 1
+        n -= 1
+    return shift + (mask & -mask).bit_length() - 1
 
-        if can_place_ship(board, row, col, ship_size, orientation):
-            ship_cells = []
 
-            if orientation == "H":
-                for i in range(ship_size):
-                    board[row][col + i] = "S"
-                    ship_cells.append((row, col + i))
-            else:
-                for i in range(ship_size):
-                    board[row + i][col] = "S"
-                    ship_cells.append((row + i, col))
+def random_placement(size, used, ship_size, rng):
+    """
+    Uniformly random legal placement as (row, col, orientation),
+    or None if the ship does not fit anywhere.
+    """
+    horizontal, vertical = placement_starts(size, used, ship_size)
+    h_count = popcount(horizontal)
+    total = h_count + popcount(vertical)
+    if not total:
+        return None
+
+    pick = rng.randrange(total)
+    if pick < h_count:
+        row, col = divmod(_nth_set_bit(horizontal, pick), size)
+        return row, col, "H"
+    row, col = divmod(_nth_set_bit(vertical, pick - h_count), size)
+    return row, col, "V"
+
+
+def check_fleet(size, ship_sizes):
+    if any(ship_size < 1 for ship_size in ship_sizes):
+        raise ValueError("ship sizes must be positive")
+    if ship_sizes and max(ship_sizes) > size:
+        raise ValueError(
+            f"a ship of size {max(ship_sizes)} does not fit on a {size}x{size} board"
+        )
+    if sum(ship_sizes) > size * size:
+        raise ValueError(
+            f"fleet of {sum(ship_sizes)} cells does not fit on a {size}x{size} board"
+        )
+
+
+def random_layout(size, ship_sizes, rng=None, used=0):
+    """
+    Ship masks for one random fleet layout that avoids `used`.
+    Raises ValueError if the fleet cannot be fitted.
+    """
+    if rng is None:
+        rng = random
+    check_fleet(size, ship_sizes)
+
+    for _ in range(FLEET_RETRIES):
+        occupied = used
+        masks = []
+        for ship_size in ship_sizes:
+            placement = random_placement(size, occupied, ship_size, rng)
+            if placement is None:
+                break
+            mask = ship_mask(size, placement[0], placement[1], ship_size, placement[2])
+            occupied |= mask
+            masks.append(mask)
+        else:
+            return masks
+
+    raise ValueError(
+        f"could not fit ships {list(ship_sizes)} on a {size}x{size} board "
+        f"after {FLEET_RETRIES} attempts"
+    )
+
+
+def generate_layouts(size, ship_sizes, count=None, rng=None):
+    """
+    Yields independent random fleet layouts (lists of ship masks).
+    Runs forever when count is None.
+    """
+    if rng is None:
+        rng = random
+    produced = 0
+    while count is None or produced < count:
+        yield random_layout(size, ship_sizes, rng)
+        produced += 1
+
+
+def fleet_for_board(size, density=FLEET_DENSITY):
+    """
+    Ship sizes covering about `density` of a size x size board, repeating
+    the classic 5-4-3-3-2 fleet and leaving each ship room to move.
+    """
+    target = max(2, round(density * size * size))
+    longest = max(2, size - 2)
+    sizes = []
+    total = 0
+    while total < target:
+        ship_size = min(FLEET_PATTERN[len(sizes) % len(FLEET_PATTERN)], longest)
+        ship_size = min(ship_size, target - total)
+        if ship_size < 2 and sizes:
+            break
+        sizes.append(ship_size)
+        total += ship_size
+    return sorted(sizes, reverse=True)
+
+
+# ---------- PLACEMENT ----------
+
+def place_ship(board, ship_size, rng=None):
+    if rng is None:
+        rng = random
+    size = len(board)
 
-            return ship_cells
+    placement = random_placement(size, board.used, ship_size, rng)
+    if placement is None:
+        raise ValueError(
+            f"no room for a ship of size {ship_size} on this {size}x{size} board"
+        )
+    row, col, orientation = placement
+    return place_ship_at(board, row, col, ship_size, orientation)
 
-def place_all_ships(board, ship_sizes, ships_list=None):
+def place_all_ships(board, ship_sizes, ships_list=None, rng=None):
     if ships_list is None:
         ships_list = []
 
-    for ship_size in ship_sizes:
-        ship_cells = place_ship(board, ship_size)
-        ships_list.append(ship_cells)
+    # Pick the whole layout first so a failed attempt leaves the board untouched.
+    for mask in random_layout(len(board), ship_sizes, rng, board.used):
+        ship_id = board.add_ship(mask)
+        ships_list.append(board.fleet.ships[ship_id])
 
     return ships_list
@@ -0,0 +1,161 @@
+"""
+Headless AI simulation runner.
+
+Plays complete games of each AI difficulty against randomly placed
+fleets and reports throughput and shots-to-win statistics.
+
+    python -m simulate --games 1000 --sizes 5 7 10 --workers 4
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import profiling
+from ai import DIFFICULTIES
+from game import GameSession, SHIP_CONFIGS, COMPUTER, fleet_for_size
+
+
+# ---------- SINGLE GAME ----------
+
+def game_rng(seed, board_size, difficulty, index):
+    # String seeds are hashed deterministically, so every game gets its
+    # own reproducible stream no matter which worker plays it.
+    return random.Random(f"{seed}:{board_size}:{difficulty}:{index}")
+
+
+def play_game(board_size, difficulty, rng, max_turns=None, log_path=None):
+    """
+    Lets the AI clear a randomly placed fleet.
+    Returns (shots, finished); skipped AI turns count toward max_turns.
+    The game's move log is saved to log_path if one is given.
+    """
+    if max_turns is None:
+        max_turns = 2 * board_size * board_size
+
+    session = GameSession(
+        board_size, fleet_for_size(board_size), difficulty, rng=rng
+    )
+    session.auto_place_player()
+    session.finish_placement()
+
+    shots = 0
+    for _ in range(max_turns):
+        session.skip_player_turn()
+        move, _ = session.ai_move()
+        if move is not None:
+            shots += 1
+        if session.is_over:
+            break
+
+    if log_path is not None:
+        session.log.save(log_path)
+    return shots, session.winner == COMPUTER
+
+
+def play_batch(board_size, difficulty, seed, start, count, log_dir=None):
+    results = []
+    for index in range(start, start + count):
+        rng = game_rng(seed, board_size, difficulty, index)
+        log_path = None
+        if log_dir is not None:
+            name = f"{board_size}-{difficulty.replace(' ', '_')}-{index}.bslog"
+            log_path = os.path.join(log_dir, name)
+        began = time.perf_counter()
+        shots, finished = play_game(board_size, difficulty, rng, log_path=log_path)
+        results.append((shots, finished, time.perf_counter() - began))
+    return board_size, difficulty, results
+
+
+# ---------- STATS ----------
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(results):
+    shots = sorted(s for s, finished, _ in results if finished)
+    seconds = [t for _, _, t in results]
+    return {
+        "games": len(results),
+        "unfinished": sum(1 for _, finished, _ in results if not finished),
+        "mean": sum(shots) / len(shots) if shots else float("nan"),
+        "p50": percentile(shots, 50),
+        "p99": percentile(shots, 99),
+        "ms_per_game": 1000 * sum(seconds) / len(seconds) if seconds else 0.0,
+    }
+
+
+# ---------- RUNNER ----------
+
+def run(games, sizes, difficulties, workers, seed, chunk_size=50, log_dir=None):
+    tasks = []
+    for board_size in sizes:
+        for difficulty in difficulties:
+            for start in range(0, games, chunk_size):
+                tasks.append(
+                    (board_size, difficulty, seed, start,
+                     min(chunk_size, games - start), log_dir)
+                )
+
+    results = {}
+    began = time.perf_counter()
+
+    if workers == 1:
+        batches = [play_batch(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_batch, *task) for task in tasks]
+            batches = [f.result() for f in futures]
+
+    for board_size, difficulty, batch in batches:
+        results.setdefault((board_size, difficulty), []).extend(batch)
+
+    return results, time.perf_counter() - began
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Battleship AI simulations")
+    parser.add_argument("--games", type=int, default=200, help="games per size and difficulty")
+    parser.add_argument("--sizes", type=int, nargs="+", default=sorted(SHIP_CONFIGS))
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-dir", help="save every game's binary move log here")
+    parser.add_argument("--profile", nargs="?", const=profiling.TRACE_PATH, metavar="TRACE",
+                        help="time every turn stage (runs on one worker)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        # Spans are collected in this process only.
+        profiling.enable(args.profile)
+        args.workers = 1
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
+    results, wall = run(args.games, args.sizes, args.difficulties, args.workers,
+                        args.seed, log_dir=args.log_dir)
+    total = sum(len(r) for r in results.values())
+
+    print(f"{total} games in {wall:.2f}s on {args.workers} worker(s): "
+          f"{total / wall:.1f} games/sec")
+    print(f"{'size':>5} {'difficulty':<10} {'games':>6} {'unfinished':>10} "
+          f"{'mean':>7} {'p50':>5} {'p99':>5} {'ms/game':>8}")
+    for (board_size, difficulty), batch in sorted(results.items()):
+        stats = summarize(batch)
+        print(f"{board_size:>5} {difficulty:<10} {stats['games']:>6} {stats['unfinished']:>10} "
+              f"{stats['mean']:>7.2f} {stats['p50']:>5} {stats['p99']:>5} "
+              f"{stats['ms_per_game']:>8.3f}")
+
+    if args.profile:
+        print()
+        profiling.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,695 @@
+"""
+Exact optimal shot policy for small boards, and its lookup table.
+
+Every legal fleet layout is enumerated and weighted by how likely
+ships.random_layout is to produce it. The shooter's knowledge is then
+the set of layouts consistent with every result so far, and a state is
+that set (a bitset over the layouts) plus the mask of cells that were
+hits. The solver runs a memoized depth-first search over these states,
+minimizing expected shots-to-win:
+
+    V(state) = 1 + min over cells c of  sum over results r  P(r | c) V(state after r)
+
+Results are miss, hit, or "sunk a ship of size s". States are folded
+under the 8 symmetries of the square before the memo lookup. Moves are
+tried in order of hit probability, and a move is dropped as soon as its
+cost plus a lower bound on the rest cannot beat the best so far (see
+lower_bound and ship_bound).
+
+The optimal policy is then written out as a decision tree: one node per
+state reached by optimal play, holding the cell to fire at and the
+child node for each result. The Perfect difficulty walks this tree, so
+a move is one lookup.
+
+    python -m solver --size 5
+    python -m solver --size 7 --max-states 2000000
+
+Tables are stored next to the opening books as a header, the fleet,
+and one record per node: cell index, then a child index per result
+(-1 where the game is over or the result is impossible).
+"""
+
+import os
+import struct
+from functools import lru_cache
+from hashlib import blake2b
+from math import gcd
+
+from board import MISS, HIT
+from openings import BOOK_DIR, book_key
+
+MAGIC = b"BSPL"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBBBI")
+
+# Outcome slots of a node: miss, hit, then one per distinct ship size
+# (largest first) for "sunk a ship of that size".
+MISS_SLOT = 0
+HIT_SLOT = 1
+SUNK_SLOT = 2
+
+# Costs closer than this are treated as equal when pruning.
+EPSILON = 1e-9
+
+# Entries in each of the solver's caches (not the memo) before it is
+# emptied; the state cache also keeps under SEEN_BYTES of layout bitsets.
+CACHE_LIMIT = 500000
+SEEN_BYTES = 256 * 1024 * 1024
+
+# Most places of one ship that ship_bound solves exactly.
+SINGLE_MAX = 12
+
+# Set bit positions of every byte value.
+BYTE_BITS = [tuple(j for j in range(8) if value >> j & 1) for value in range(256)]
+
+
+def policy_path(board_size, ship_sizes, policy_dir=BOOK_DIR):
+    fleet = "-".join(str(s) for s in book_key(ship_sizes))
+    return os.path.join(policy_dir, f"{board_size}x{board_size}_{fleet}.policy")
+
+
+def ship_classes(ship_sizes):
+    """Distinct ship sizes, largest first; sunk results are reported per size."""
+    return sorted(set(ship_sizes), reverse=True)
+
+
+# ---------- LOOKUP TABLE ----------
+
+class Policy:
+    """
+    Decision tree of an optimal policy. `cells[node]` is the shot at a
+    node and `children[node][slot]` the node after each result.
+    `sunk_slot[ship_id]` maps the ships of the fleet it was loaded for
+    (in fleet order, as GameSession places them) to their result slot.
+    """
+
+    __slots__ = ("board_size", "cells", "children", "sunk_slot")
+
+    def __init__(self, board_size, cells, children, sunk_slot):
+        self.board_size = board_size
+        self.cells = cells
+        self.children = children
+        self.sunk_slot = sunk_slot
+
+    def __len__(self):
+        return len(self.cells)
+
+    def next_node(self, node, result):
+        if result.kind == MISS:
+            slot = MISS_SLOT
+        elif result.kind == HIT:
+            slot = HIT_SLOT
+        else:
+            slot = self.sunk_slot[result.ship_id]
+        return self.children[node][slot]
+
+
+def encode_policy(board_size, ship_sizes, nodes):
+    sizes = ship_classes(ship_sizes)
+    record = struct.Struct(f"<H{SUNK_SLOT + len(sizes)}i")
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, board_size, len(sizes), len(nodes)),
+        bytes(sizes),
+        *(record.pack(cell, *children) for cell, children in nodes),
+    ])
+
+
+def decode_policy(data):
+    """(board_size, ship classes, cells, children) from table bytes."""
+    magic, version, board_size, classes, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a policy table")
+    if version != VERSION:
+        raise ValueError(f"unsupported policy table version {version}")
+    sizes = list(data[HEADER.size:HEADER.size + classes])
+    record = struct.Struct(f"<H{SUNK_SLOT + classes}i")
+    offset = HEADER.size + classes
+    if len(data) < offset + count * record.size:
+        raise ValueError("policy table is truncated")
+    cells = []
+    children = []
+    for cell, *slots in record.iter_unpack(data[offset:offset + count * record.size]):
+        cells.append(divmod(cell, board_size))
+        children.append(tuple(slots))
+    return board_size, sizes, tuple(cells), tuple(children)
+
+
+@lru_cache(maxsize=8)
+def _load_policy(board_size, ship_sizes):
+    try:
+        with open(policy_path(board_size, ship_sizes), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    size, sizes, cells, children = decode_policy(data)
+    if size != board_size or sizes != ship_classes(ship_sizes):
+        raise ValueError(f"policy table for another board filed as {board_size}x{board_size}")
+    sunk_slot = tuple(SUNK_SLOT + sizes.index(s) for s in ship_sizes)
+    return Policy(board_size, cells, children, sunk_slot)
+
+
+def load_policy(board_size, ship_sizes):
+    """Optimal policy for this board and fleet, or None if none was solved."""
+    return _load_policy(board_size, tuple(ship_sizes))
+
+
+# ---------- SOLVER ----------
+
+class SolverLimit(Exception):
+    """Raised when a solve explores more states than allowed."""
+
+
+def enumerate_layouts(board_size, ship_sizes):
+    """
+    Every legal layout as (ship masks in fleet order, weight). Weights
+    are integers proportional to the probability of sequential uniform
+    placement, which is how ships.random_layout places a fleet.
+    """
+    from math import lcm
+    from montecarlo import placements
+
+    layouts = []
+
+    def place(k, used, masks, odds):
+        if k == len(ship_sizes):
+            layouts.append((tuple(masks), odds))
+            return
+        options = [m for m in placements(board_size, ship_sizes[k]) if not m & used]
+        for mask in options:
+            place(k + 1, used | mask, masks + [mask], odds * len(options))
+
+    place(0, 0, [], 1)
+    scale = lcm(*{odds for _, odds in layouts})
+    return [(masks, scale // odds) for masks, odds in layouts]
+
+
+def _symmetries(board_size):
+    """Cell permutations of the 8 symmetries of the square."""
+    n = board_size
+    maps = (
+        lambda r, c: (r, c),
+        lambda r, c: (c, n - 1 - r),
+        lambda r, c: (n - 1 - r, n - 1 - c),
+        lambda r, c: (n - 1 - c, r),
+        lambda r, c: (c, r),
+        lambda r, c: (n - 1 - c, n - 1 - r),
+        lambda r, c: (r, n - 1 - c),
+        lambda r, c: (n - 1 - r, c),
+    )
+    perms = []
+    for f in maps:
+        perm = []
+        for i in range(n * n):
+            r, c = f(*divmod(i, n))
+            perm.append(r * n + c)
+        perms.append(perm)
+    return perms
+
+
+def _byte_tables(perm, bits):
+    """Per byte of a `bits`-bit mask: the image of that byte's bits under `perm`."""
+    tables = []
+    for chunk in range((bits + 7) // 8):
+        table = [0] * 256
+        for value in range(1, 256):
+            low = value & -value
+            bit = 8 * chunk + low.bit_length() - 1
+            image = 1 << perm[bit] if bit < bits else 0
+            table[value] = table[value ^ low] | image
+        tables.append(table)
+    return tables
+
+
+class Solver:
+    """
+    Memoized search for the policy minimizing expected shots-to-win.
+    `states` counts memoized states, solved or only bounded, and
+    `max_states` caps it; `visits` counts searches, repeats included.
+
+    Every legal layout is numbered, and a state is (layouts, hits): a
+    bitset of the layouts consistent with the results so far, and the
+    mask of cells that were hits. That is all the future depends on,
+    and both halves fold under the board's symmetries.
+    """
+
+    def __init__(self, board_size, ship_sizes, max_states=None):
+        from montecarlo import placements_through
+
+        self.board_size = board_size
+        self.fleet = list(ship_sizes)
+        self.max_states = max_states
+        # Canonical key -> (value, best cell), or just a lower bound for
+        # states only searched far enough to rule them out.
+        self.memo = {}
+        self.visits = 0
+        # State -> [lower bound, canonical key or None, symmetry].
+        self.seen = {}
+
+        self.cells = cells = board_size * board_size
+        self.classes = ship_classes(self.fleet)
+        self.slots = [SUNK_SLOT + self.classes.index(size) for size in self.fleet]
+        self.fleet_cells = sum(self.fleet)
+
+        layouts = enumerate_layouts(board_size, self.fleet)
+        self.layouts = layouts
+        self.unions = []
+        self.cover = [0] * cells
+        # Per ship, per placement mask: the layouts with that ship there.
+        self.placed = [{} for _ in self.fleet]
+        by_weight = {}
+        for i, (masks, weight) in enumerate(layouts):
+            bit = 1 << i
+            union = 0
+            for k, mask in enumerate(masks):
+                self.placed[k][mask] = self.placed[k].get(mask, 0) | bit
+                union |= mask
+            self.unions.append(union)
+            while union:
+                low = union & -union
+                self.cover[low.bit_length() - 1] |= bit
+                union ^= low
+            by_weight[weight] = by_weight.get(weight, 0) | bit
+        self.all_layouts = (1 << len(layouts)) - 1
+        # Weights are summed per class of equal weight, by popcount.
+        self.weights = sorted(by_weight.items())
+        self.cover_weights = [
+            [(weight, cover & members) for weight, members in self.weights if cover & members]
+            for cover in self.cover
+        ]
+        self.through = [placements_through(board_size, size) for size in self.fleet]
+
+        self.perms = _symmetries(board_size)
+        self.inverse = [[0] * cells for _ in self.perms]
+        for inverse, perm in zip(self.inverse, self.perms):
+            for i, j in enumerate(perm):
+                inverse[j] = i
+        self.cell_maps = [_byte_tables(perm, cells) for perm in self.perms]
+        # Layout images are looked up lazily, per symmetry and byte.
+        index = {masks: i for i, (masks, _) in enumerate(layouts)}
+        self.layout_perms = [
+            [index[tuple(self._map(g, mask) for mask in masks)] for masks, _ in layouts]
+            for g in range(8)
+        ]
+        self.layout_maps = [{} for _ in range(8)]
+        self.layout_bytes = (len(layouts) + 7) // 8
+        self.key_bytes = (len(layouts) + cells + 7) // 8
+        self.seen_limit = min(CACHE_LIMIT, SEEN_BYTES // self.layout_bytes)
+
+        # For ship_bound: per layout and ship, the other ships' masks.
+        self.others = [
+            [masks[:k] + masks[k + 1:] for k in range(len(masks))] for masks, _ in layouts
+        ]
+        self.single_memo = {}
+
+    @property
+    def states(self):
+        return len(self.memo)
+
+    def root(self):
+        return self.all_layouts, 0
+
+    def weight(self, layouts):
+        return sum(weight * (layouts & members).bit_count() for weight, members in self.weights)
+
+    def _map(self, g, mask):
+        image = 0
+        for table in self.cell_maps[g]:
+            if not mask:
+                break
+            image |= table[mask & 0xFF]
+            mask >>= 8
+        return image
+
+    def _map_layouts(self, g, layouts):
+        perm = self.layout_perms[g]
+        cache = self.layout_maps[g]
+        image = 0
+        for chunk, byte in enumerate(layouts.to_bytes(self.layout_bytes, "little")):
+            if not byte:
+                continue
+            piece = cache.get((chunk, byte))
+            if piece is None:
+                piece = 0
+                for j in range(8):
+                    if byte >> j & 1:
+                        piece |= 1 << perm[8 * chunk + j]
+                cache[(chunk, byte)] = piece
+            image |= piece
+        return image
+
+    def canonical(self, state, live):
+        """
+        (key, g): the smallest image of `state` and the symmetry giving
+        it. `live` is the mask of cells some layout still needs.
+        """
+        # Symmetries are first ranked by the images of the hits and the
+        # live cells; only ties are compared on the layouts themselves.
+        layouts, hits = state
+        ranked = [((self._map(g, hits), self._map(g, live)), g) for g in range(8)]
+        first = min(ranked)[0]
+        tied = [g for rank, g in ranked if rank == first]
+        if len(tied) == 1:
+            g = tied[0]
+            image = self._map_layouts(g, layouts)
+        else:
+            image, g = min((self._map_layouts(g, layouts), g) for g in tied)
+        # Millions of keys are kept, so each is a 128-bit digest of the
+        # image; a collision is far less likely than a hardware fault.
+        key = (image << self.cells | first[0]).to_bytes(self.key_bytes, "little")
+        return blake2b(key, digest_size=16).digest(), g
+
+    def split(self, state, cell):
+        """
+        Results of firing at `cell`: (slot, weight, child state or None
+        if the game is over, unshot ship cells of the child times its
+        weight) per possible result.
+        """
+        layouts, hits = state
+        covered = layouts & self.cover[cell]
+        shot = hits | 1 << cell
+        outcomes = []
+        if covered != layouts:
+            outcomes.append((MISS_SLOT, layouts & ~covered, hits))
+
+        # A ship sinks where this shot completes it.
+        sunk = {}
+        for k, through in enumerate(self.through):
+            placed = self.placed[k]
+            for mask in through[cell]:
+                if not mask & ~shot:
+                    done = placed.get(mask, 0) & covered
+                    if done:
+                        slot = self.slots[k]
+                        sunk[slot] = sunk.get(slot, 0) | done
+        for slot, done in sunk.items():
+            outcomes.append((slot, done, shot))
+            covered &= ~done
+        if covered:
+            outcomes.append((HIT_SLOT, covered, shot))
+
+        left = self.fleet_cells - shot.bit_count()
+        results = []
+        for slot, child, child_hits in outcomes:
+            weight = self.weight(child)
+            if child_hits == shot and not left:
+                results.append((slot, weight, None, 0))
+            elif child_hits == shot:
+                results.append((slot, weight, (child, shot), weight * left))
+            else:
+                results.append((slot, weight, (child, hits), weight * (left + 1)))
+        return results
+
+    def lower_bound(self, state):
+        """
+        (total weight, bound, cells, moves, live). `cells` is the number
+        of unshot ship cells, the same for every layout, and `moves` the
+        (hit weight, cell) of every useful shot, likeliest hit first.
+        Until the first hit every shot misses, and by the union bound the
+        first j shots all miss with probability at least 1 - (sum of the
+        j highest hit chances); adding those expected misses to `cells`
+        gives a bound no policy can beat.
+        """
+        layouts, hits = state
+        total = self.weight(layouts)
+        moves = []
+        live = 0
+        for cell, cover in enumerate(self.cover_weights):
+            if hits >> cell & 1:
+                continue
+            weight = 0
+            for w, members in cover:
+                weight += w * (layouts & members).bit_count()
+            if weight:
+                moves.append((weight, cell))
+                live |= 1 << cell
+        moves.sort(key=lambda move: (-move[0], move[1]))
+
+        misses = 0
+        covered = 0
+        for weight, _ in moves:
+            covered += weight
+            if covered >= total:
+                break
+            misses += total - covered
+        cells = self.fleet_cells - hits.bit_count()
+        return total, cells + misses / total, cells, moves, live
+
+    def _members(self, layouts):
+        """Indices of the layouts in a bitset."""
+        for chunk, byte in enumerate(layouts.to_bytes(self.layout_bytes, "little")):
+            if byte:
+                base = 8 * chunk
+                for j in BYTE_BITS[byte]:
+                    yield base + j
+
+    def ship_bound(self, state, total, cells):
+        """
+        A tighter bound, for states the cheap one does not rule out. Show
+        the shooter every ship but one: the misses it still needs to sink
+        that one are no more than the game needs. Where the revealed ships
+        leave at most SINGLE_MAX places for it, those misses are solved
+        exactly (single_misses); otherwise only the misses before it is
+        first hit are counted, by the union bound as in lower_bound.
+        """
+        layouts, hits = state
+        blocks = [{} for _ in self.fleet]
+        for i in self._members(layouts):
+            masks, weight = self.layouts[i]
+            others = self.others[i]
+            for k, mask in enumerate(masks):
+                left = mask & ~hits
+                if left:
+                    block = blocks[k].get(others[k])
+                    if block is None:
+                        block = blocks[k][others[k]] = {}
+                    block[left] = block.get(left, 0) + weight
+
+        most = 0
+        for ship_blocks in blocks:
+            misses = 0
+            for block in ship_blocks.values():
+                if len(block) == 1:
+                    continue
+                weight = sum(block.values())
+                if len(block) <= SINGLE_MAX:
+                    misses += weight * self.single_misses(tuple(sorted(block.items())))
+                    continue
+                hit_weight = {}
+                for mask, w in block.items():
+                    while mask:
+                        low = mask & -mask
+                        hit_weight[low] = hit_weight.get(low, 0) + w
+                        mask ^= low
+                covered = 0
+                for w in sorted(hit_weight.values(), reverse=True):
+                    covered += w
+                    if covered >= weight:
+                        break
+                    misses += weight - covered
+            most = max(most, misses)
+        return cells + most / total
+
+    def single_misses(self, candidates):
+        """
+        Least expected misses to sink one ship that is at one of
+        `candidates`, (unshot cells, weight) pairs, with nothing else
+        on the board to hit.
+        """
+        if len(candidates) == 1:
+            return 0
+        divisor = gcd(*(weight for _, weight in candidates))
+        if divisor > 1:
+            candidates = tuple((mask, weight // divisor) for mask, weight in candidates)
+        known = self.single_memo.get(candidates)
+        if known is not None:
+            return known
+
+        total = 0
+        union = 0
+        for mask, weight in candidates:
+            total += weight
+            union |= mask
+        best = float("inf")
+        while union:
+            bit = union & -union
+            union ^= bit
+            missed = []
+            hit = []
+            missed_weight = 0
+            for mask, weight in candidates:
+                if not mask & bit:
+                    missed.append((mask, weight))
+                    missed_weight += weight
+                elif mask != bit:
+                    hit.append((mask ^ bit, weight))
+            cost = 0
+            if missed:
+                cost += missed_weight / total * (1 + self.single_misses(tuple(missed)))
+            if len(hit) > 1:
+                hit_weight = sum(weight for _, weight in hit)
+                cost += hit_weight / total * self.single_misses(tuple(sorted(hit)))
+            best = min(best, cost)
+        if len(self.single_memo) >= CACHE_LIMIT:
+            self.single_memo.clear()
+        self.single_memo[candidates] = best
+        return best
+
+    def value(self, state, cutoff=float("inf")):
+        """
+        (expected shots to win, best cell index) for a state. If the
+        value is at least `cutoff`, a lower bound of at least `cutoff`
+        is returned instead, with no cell.
+        """
+        layouts, hits = state
+        if not layouts & (layouts - 1):
+            remaining = self.unions[layouts.bit_length() - 1] & ~hits
+            return remaining.bit_count(), (remaining & -remaining).bit_length() - 1
+
+        # Parents ask about the same children again and again, so the
+        # bound and canonical key of recent states are kept.
+        lower = None
+        known = self.seen.get(state)
+        if known is None:
+            if len(self.seen) >= self.seen_limit:
+                self.seen.clear()
+            lower = self.lower_bound(state)
+            known = self.seen[state] = [lower[1], None, 0]
+        bound, key, g = known
+        if bound >= cutoff - EPSILON:
+            return bound, None
+
+        if key is None:
+            lower = lower or self.lower_bound(state)
+            key, g = known[1:] = self.canonical(state, lower[4])
+        cached = self.memo.get(key)
+        if cached is None:
+            lower = lower or self.lower_bound(state)
+            bound = self.ship_bound(state, lower[0], lower[2])
+            if bound >= cutoff - EPSILON:
+                self.memo[key] = bound
+                return bound, None
+        elif type(cached) is tuple:
+            value, cell = cached
+            return value, self.inverse[g][cell]
+        elif cached >= cutoff - EPSILON:
+            return cached, None
+        # Otherwise only a lower bound below this cutoff is known: search again.
+
+        if self.max_states is not None and len(self.memo) >= self.max_states:
+            raise SolverLimit(f"more than {self.max_states} states")
+        self.visits += 1
+        total, _, cells, moves, _ = lower or self.lower_bound(state)
+
+        # Moves are searched most likely hit first, each only while it can
+        # still beat both the best move so far and the cutoff.
+        best = cutoff
+        best_cell = None
+        # The least any move ruled out so far was shown to cost.
+        floor = float("inf")
+        for weight, cell in moves:
+            # A hit removes one unshot cell, so after this shot at least
+            # `rest` more are needed; later moves are less likely hits.
+            rest = cells - weight / total
+            if 1 + rest >= best - EPSILON:
+                floor = min(floor, 1 + rest)
+                break
+            cost = 1.0
+            for _, weight, child, child_cells in self.split(state, cell):
+                if child is None:
+                    continue
+                rest -= child_cells / total
+                share = weight / total
+                value, _ = self.value(child, (best - cost - rest) / share)
+                cost += share * value
+                if cost + rest >= best - EPSILON:
+                    floor = min(floor, cost + rest)
+                    break
+            else:
+                best, best_cell = cost, cell
+
+        if best_cell is None:
+            # Every move costs at least the cutoff; remember how much.
+            floor = max(floor, bound, cached or 0)
+            self.memo[key] = floor
+            return floor, None
+        self.memo[key] = (best, self.perms[g][best_cell])
+        return best, best_cell
+
+    def policy_nodes(self, state=None):
+        """
+        The optimal policy from `state` (default: the start of a game)
+        as a list of (cell index, children); node 0 is the first shot.
+        """
+        if state is None:
+            state = self.root()
+        nodes = []
+        index = {}
+
+        def visit(state):
+            if state in index:
+                return index[state]
+            _, cell = self.value(state)
+            node = len(nodes)
+            index[state] = node
+            nodes.append(None)
+            children = [-1] * (SUNK_SLOT + len(self.classes))
+            for slot, _, child, _ in self.split(state, cell):
+                if child is not None:
+                    children[slot] = visit(child)
+            nodes[node] = (cell, children)
+            return node
+
+        visit(state)
+        return nodes
+
+
+def write_policy(board_size, ship_sizes, nodes, policy_dir=BOOK_DIR):
+    os.makedirs(policy_dir, exist_ok=True)
+    path = policy_path(board_size, ship_sizes, policy_dir)
+    with open(path, "wb") as f:
+        f.write(encode_policy(board_size, ship_sizes, nodes))
+    return path
+
+
+def main(argv=None):
+    # Imported here: the loader above is on the game's startup path.
+    import argparse
+    import sys
+    import time
+    from game import fleet_for_size
+
+    parser = argparse.ArgumentParser(description="Solve small boards exactly")
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--fleet", type=int, nargs="+", help="ship sizes (default: the board's fleet)")
+    parser.add_argument("--max-states", type=int, help="give up after this many states")
+    parser.add_argument("--out", default=BOOK_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="solve without writing the table")
+    args = parser.parse_args(argv)
+
+    fleet = args.fleet or fleet_for_size(args.size)
+    # Deep boards recurse once per shot and result.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20 * args.size * args.size))
+
+    began = time.perf_counter()
+    solver = Solver(args.size, fleet, args.max_states)
+    root = solver.root()
+    print(f"{args.size}x{args.size} {fleet}: {len(solver.layouts)} layouts")
+    try:
+        expected, _ = solver.value(root)
+    except SolverLimit as e:
+        print(f"gave up after {time.perf_counter() - began:.1f}s: {e} "
+              f"({solver.visits} searched)")
+        return 1
+    solved = time.perf_counter() - began
+    nodes = solver.policy_nodes(root)
+    print(f"expected shots-to-win {expected:.4f}; {solver.states} states solved "
+          f"({solver.visits} searched) in {solved:.2f}s; policy has {len(nodes)} nodes")
+    if not args.dry_run:
+        path = write_policy(args.size, fleet, nodes, args.out)
+        print(f"{path}: {os.path.getsize(path)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,116 @@
+"""
+Shooting strategies behind a common interface, and a registry of them.
+
+A strategy is made once per game from the board size and fleet, then
+asked for shots with choose(board) and told each outcome with
+observe(cell, result). choose() may only look at what the shooter can
+see (hits, misses and sunk ships), never at board.ships.
+
+Every AI difficulty is registered under its own name. New strategies
+register a factory, usually the class itself:
+
+    class Diagonal(Strategy):
+        ...
+
+    register("Diagonal", Diagonal)
+
+Bump `version` when a strategy's play changes so cached tournament
+results for it are replayed.
+"""
+
+import random
+
+from ai import DIFFICULTIES, new_ai_state, choose_move, record_shot
+
+# Monte Carlo samples per shot when it plays outside the GUI; a sample
+# budget instead of a time budget keeps its games reproducible.
+MC_SAMPLES = 200
+
+# name -> (factory, version)
+STRATEGIES = {}
+
+
+class Strategy:
+    """Base class: one instance plays one game."""
+
+    def __init__(self, board_size, ship_sizes, rng=None):
+        self.board_size = board_size
+        self.ship_sizes = list(ship_sizes)
+        self.rng = rng if rng is not None else random
+
+    def choose(self, board):
+        """Next (row, col) to fire at, or None if every cell is shot."""
+        raise NotImplementedError
+
+    def observe(self, cell, result):
+        """Called with the AttackResult of every shot choose() picked."""
+
+
+class DifficultyStrategy(Strategy):
+    """One of the AI difficulties, played from its usual ai_state."""
+
+    def __init__(self, difficulty, board_size, ship_sizes, rng=None, **options):
+        super().__init__(board_size, ship_sizes, rng)
+        self.difficulty = difficulty
+        self.ai_state = new_ai_state(board_size, self.rng, self.ship_sizes)
+        self.ai_state.update(options)
+
+    def choose(self, board):
+        return choose_move(board, self.ai_state, self.difficulty, self.rng)
+
+    def observe(self, cell, result):
+        record_shot(self.ai_state, cell, result, self.board_size, self.difficulty)
+
+
+def play_out(strategy, board):
+    """Shots `strategy` needs to sink every ship on `board`."""
+    shots = 0
+    while not board.all_ships_sunk():
+        move = strategy.choose(board)
+        if move is None:
+            raise RuntimeError("strategy ran out of moves with ships afloat")
+        strategy.observe(move, board.attack(*move))
+        shots += 1
+    return shots
+
+
+# ---------- REGISTRY ----------
+
+def register(name, factory, version=1):
+    """
+    Adds a strategy. `factory(board_size, ship_sizes, rng)` must return
+    a Strategy; registering a name again replaces it.
+    """
+    STRATEGIES[name] = (factory, version)
+    return factory
+
+
+def strategy_names():
+    return list(STRATEGIES)
+
+
+def strategy_version(name):
+    return STRATEGIES[name][1]
+
+
+def create_strategy(name, board_size, ship_sizes, rng=None):
+    try:
+        factory, _ = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"unknown strategy {name!r}") from None
+    return factory(board_size, ship_sizes, rng)
+
+
+def _difficulty_factory(difficulty, **options):
+    def factory(board_size, ship_sizes, rng=None):
+        return DifficultyStrategy(difficulty, board_size, ship_sizes, rng, **options)
+    return factory
+
+
+for _difficulty in DIFFICULTIES:
+    if _difficulty == "Monte Carlo":
+        register(_difficulty, _difficulty_factory(
+            _difficulty, time_budget=None, sample_budget=MC_SAMPLES
+        ))
+    else:
+        register(_difficulty, _difficulty_factory(_difficulty))
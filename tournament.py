@@ -0,0 +1,195 @@
+"""
+Round-robin tournament between registered strategies.
+
+Every strategy shoots at the same seeded fleet layouts: layout i of a
+board size is identical for all of them, and so is the shooter's own
+random stream. Shots never depend on the opponent, so a strategy's
+shots-to-win on each layout are played once and every pairing is
+scored from them: on a layout the one needing fewer shots wins, equal
+counts are a tie worth half.
+
+    python -m tournament --size 10 --games 1000 --workers 4
+
+Shots-to-win per (strategy, layout) are cached on disk, keyed by board
+size, fleet, seed and strategy version, so adding a strategy only plays
+its own games.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import create_board
+from game import fleet_for_size
+from ships import place_all_ships
+from strategies import create_strategy, play_out, strategy_names, strategy_version
+
+CACHE_DIR = os.path.expanduser("~/.battleship_tournament")
+CHUNK_SIZE = 50
+
+# Two-sided 95% normal quantile for the confidence intervals.
+Z95 = 1.96
+
+
+# ---------- PLAYING ----------
+
+def layout_board(board_size, ship_sizes, seed, index):
+    board = create_board(board_size)
+    place_all_ships(board, ship_sizes, rng=random.Random(f"layout:{board_size}:{seed}:{index}"))
+    return board
+
+
+def shots_to_win(name, board_size, ship_sizes, seed, index):
+    """Shots strategy `name` needs to sink layout `index`."""
+    board = layout_board(board_size, ship_sizes, seed, index)
+    rng = random.Random(f"shooter:{board_size}:{seed}:{index}")
+    return play_out(create_strategy(name, board_size, ship_sizes, rng), board)
+
+
+def play_chunk(name, board_size, ship_sizes, seed, indices):
+    return name, {i: shots_to_win(name, board_size, ship_sizes, seed, i) for i in indices}
+
+
+# ---------- CACHE ----------
+
+def cache_path(name, board_size, ship_sizes, seed, cache_dir=CACHE_DIR):
+    fleet = "-".join(str(s) for s in ship_sizes)
+    safe = name.replace(" ", "_").replace(os.sep, "_")
+    return os.path.join(
+        cache_dir, f"{board_size}x{board_size}_{fleet}",
+        f"seed{seed}_{safe}_v{strategy_version(name)}.json"
+    )
+
+
+def load_cached(path):
+    """{layout index: shots} from a cache file, empty if there is none."""
+    try:
+        with open(path) as f:
+            return {int(i): shots for i, shots in json.load(f).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cached(path, results):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({str(i): shots for i, shots in sorted(results.items())}, f)
+    os.replace(tmp, path)
+
+
+# ---------- RUNNER ----------
+
+def run(names, board_size, games, seed=0, workers=1, ship_sizes=None,
+        cache_dir=CACHE_DIR, chunk_size=CHUNK_SIZE):
+    """
+    Shots-to-win lists (layouts 0..games-1 in order) per strategy, and
+    how many games had to be played rather than read from the cache.
+    """
+    if ship_sizes is None:
+        ship_sizes = fleet_for_size(board_size)
+    ship_sizes = list(ship_sizes)
+
+    results = {}
+    tasks = []
+    for name in names:
+        path = cache_path(name, board_size, ship_sizes, seed, cache_dir) if cache_dir else None
+        results[name] = load_cached(path) if path else {}
+        missing = [i for i in range(games) if i not in results[name]]
+        for start in range(0, len(missing), chunk_size):
+            tasks.append((name, board_size, ship_sizes, seed, missing[start:start + chunk_size]))
+
+    if workers == 1:
+        chunks = [play_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_chunk, *task) for task in tasks]
+            chunks = [f.result() for f in futures]
+
+    for name, played in chunks:
+        results[name].update(played)
+    if cache_dir:
+        for name in {name for name, _ in chunks}:
+            save_cached(cache_path(name, board_size, ship_sizes, seed, cache_dir), results[name])
+
+    played = sum(len(task[-1]) for task in tasks)
+    return {name: [results[name][i] for i in range(games)] for name in names}, played
+
+
+# ---------- STATS ----------
+
+def mean_ci(values):
+    """Mean and half-width of its 95% confidence interval."""
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, float("nan")
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    return mean, Z95 * math.sqrt(variance / n)
+
+
+def percentile(sorted_values, pct):
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def head_to_head(mine, theirs):
+    """Per-layout scores: 1 for fewer shots, 0.5 for a tie, 0 otherwise."""
+    return [1.0 if a < b else 0.5 if a == b else 0.0 for a, b in zip(mine, theirs)]
+
+
+def report(results):
+    names = list(results)
+    print(f"{'strategy':<12} {'games':>6} {'mean':>7} {'95% CI':>7} "
+          f"{'p10':>4} {'p50':>4} {'p90':>4} {'max':>4}")
+    for name in sorted(names, key=lambda n: sum(results[n]) / len(results[n])):
+        shots = sorted(results[name])
+        mean, ci = mean_ci(shots)
+        print(f"{name:<12} {len(shots):>6} {mean:>7.2f} {'±' + format(ci, '.2f'):>7} "
+              f"{percentile(shots, 10):>4} {percentile(shots, 50):>4} "
+              f"{percentile(shots, 90):>4} {shots[-1]:>4}")
+
+    print()
+    print("win rate of row vs column (ties count half), ± 95% CI")
+    width = max(14, max(len(n) for n in names) + 1)
+    print(" " * 12 + "".join(f"{n:>{width}}" for n in names))
+    for row in names:
+        cells = []
+        for column in names:
+            if row == column:
+                cells.append(f"{'-':>{width}}")
+                continue
+            rate, ci = mean_ci(head_to_head(results[row], results[column]))
+            cells.append(f"{f'{100 * rate:.1f}±{100 * ci:.1f}%':>{width}}")
+        print(f"{row:<12}" + "".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI strategies")
+    parser.add_argument("--size", type=int, default=10)
+    parser.add_argument("--games", type=int, default=500, help="layouts per strategy")
+    parser.add_argument("--strategies", nargs="+", default=strategy_names())
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    began = time.perf_counter()
+    results, played = run(
+        args.strategies, args.size, args.games, args.seed, args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir
+    )
+    total = len(args.strategies) * args.games
+    print(f"{args.size}x{args.size}: {total} games, {played} played and "
+          f"{total - played} from cache in {time.perf_counter() - began:.2f}s")
+    print()
+    report(results)
+
+
+if __name__ == "__main__":
+    main()